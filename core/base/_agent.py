@@ -6,13 +6,25 @@
 from __future__ import annotations
 
 import inspect
-from typing import Any
+from typing    import Any
+from functools import lru_cache
 
 from jinja2 import Environment, BaseLoader
 
 import ww
 
 
+_env         = Environment(loader=BaseLoader())
+_env.globals = {'len': len}
+
+
+# Compile template source once, reuse for all renders
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=512)
+def _compile(template: str):
+	return _env.from_string(String.unindent(template))
+
+
 class Agent(ww.base.Operator):
 	ResponseSchema  : Any  = None                       # Output schema for LLM response
 	intent          : str  = None                       # Semantic role in project
@@ -30,8 +42,7 @@ class Agent(ww.base.Operator):
 	# Execute agent call lifecycle
 	# ----------------------------------------------------------------------
 	async def __call__(self, *args, **kwargs):
-		signature = inspect.signature(self.invoke)       # Inspect invoke signature
-		arg_names = [param.name for param in signature.parameters.values()]
+		arg_names = [name for name, _ in self.__ww_params__]  # Precomputed invoke signature
 
 		n = 0
 		for n in range(min(len(args), len(arg_names))):
@@ -85,14 +96,14 @@ class Agent(ww.base.Operator):
 	# ----------------------------------------------------------------------
 	async def _collect_props(self, state=None):
 		state = state or self.state
-		for name in dir(self.__class__):
-			if not name.startswith('__'):
-				prop = getattr(self.__class__, name)
-				if isinstance(prop, property):
-					prop = getattr(self, name)
-					state[name] = await prop if inspect.isawaitable(prop) else prop
-				elif is_atomic(prop):
-					state[name] = prop
+		cls   = self.__class__
+
+		for name in cls.__ww_props__:
+			prop = getattr(self, name)
+			state[name] = await prop if inspect.isawaitable(prop) else prop
+
+		for name in cls.__ww_atomics__:
+			state[name] = getattr(cls, name)
 
 	# ======================================================================
 	# PUBLIC METHODS
@@ -123,11 +134,8 @@ class Agent(ww.base.Operator):
 			raise RuntimeError(f'Template is not defined in `{self.name}`')
 
 		try:
-			template  = String.unindent(template)
 			all_vars  = {**self.state.to_dict(), **vars, 'ww': ww}
-			env       = Environment(loader=BaseLoader())
-			env.globals = {'len': len}
-			jinja     = env.from_string(template)
+			jinja     = _compile(template)
 			prompt    = String.unindent(jinja.render(**all_vars))
 		except Exception as e:
 			raise ValueError(
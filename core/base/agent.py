@@ -2,11 +2,14 @@ import inspect
 
 from jinja2 import Environment, DictLoader
 
-import ww, o
+import ww
 
 
 class Agent(ww.base.Operator):
 
+	_template_names = {}                               # class → template_* attribute names
+	_envs           = {}                               # class → cached jinja environment
+
 	# Query LLM using filled prompt and response schema
 	# ----------------------------------------------------------------------
 	async def __call__(self, verbose=True):
@@ -35,29 +38,60 @@ class Agent(ww.base.Operator):
 	# PRIVATE METHODS
 	# ======================================================================
 
+	# Get jinja environment of agent class with template_* registered.
+	# Built once per class, rebuilt when any template_* attribute changes.
 	# ----------------------------------------------------------------------
 	def _make_env(self):
-		templates = {}
-		name_map  = {}
+		cls = self.__class__
+
+		if cls not in Agent._template_names:
+			Agent._template_names[cls] = [
+				name for name in dir(cls) if name.startswith('template_')
+			]
+
+		names   = Agent._template_names[cls]
+		sources = tuple(getattr(cls, name) for name in names)
+		cached  = Agent._envs.get(cls)
 
-		# Register sub-templates
-		for name in dir(self.__class__):
-			if name.startswith('template_'):
-				source = getattr(self.__class__, name)
+		if cached is None or cached['sources'] != sources:
+			templates = {}
+			name_map  = {}
+
+			# Register sub-templates
+			for name, source in zip(names, sources):
 				if isinstance(source, str):
 					key            = f'{name}.j2'
 					templates[key] = ww.String.unindent(source)
 					name_map[name] = key
 
-		loader             = DictLoader(templates)
-		env                = Environment(loader=loader)
-		env.globals['len'] = len
+			loader             = DictLoader(templates)
+			env                = Environment(loader=loader)
+			env.globals['len'] = len
+
+			cached = Agent._envs[cls] = {
+				'sources'  : sources,
+				'env'      : env,
+				'name_map' : name_map,
+				'compiled' : {}                          # template source → jinja template
+			}
 
 		# Replace ctx.self template_* with registered names
-		for name, key in name_map.items():
+		for name, key in cached['name_map'].items():
 			self.ctx.self[name] = key
 
-		return env
+		return cached
+
+	# Compile template once per class environment
+	# ----------------------------------------------------------------------
+	def _compile(self, template):
+		cached = self._make_env()
+		jinja  = cached['compiled'].get(template)
+
+		if jinja is None:
+			jinja = cached['env'].from_string(ww.String.unindent(template))
+			cached['compiled'][template] = jinja
+
+		return jinja
 
 	# ----------------------------------------------------------------------
 	# def _collect_input(self, *args, **kwargs):
@@ -71,7 +105,7 @@ class Agent(ww.base.Operator):
 	# 	self.ctx.input.update(bound.arguments)
 
 	def _collect_input(self, *args, **kwargs):
-		signature = inspect.signature(self.invoke)
+		signature = self.__ww_signature__                # Precomputed by OperatorMeta
 
 		try:
 			bound = signature.bind(*args, **kwargs)
@@ -80,14 +114,14 @@ class Agent(ww.base.Operator):
 
 		bound.apply_defaults()
 
-		for name, param in signature.parameters.items():
+		for name, kind in self.__ww_params__:
 
-			if param.kind == inspect.Parameter.VAR_POSITIONAL:
+			if kind == inspect.Parameter.VAR_POSITIONAL:
 				values = bound.arguments.get(name, ())
 				for i, value in enumerate(values):
 					self.ctx.input[str(i)] = value
 
-			elif param.kind == inspect.Parameter.VAR_KEYWORD:
+			elif kind == inspect.Parameter.VAR_KEYWORD:
 				values = bound.arguments.get(name, {})
 				for key, value in values.items():
 					self.ctx.input[key] = value
@@ -98,14 +132,14 @@ class Agent(ww.base.Operator):
 
 	# ----------------------------------------------------------------------
 	async def _collect_props(self):
-		for name in dir(self.__class__):
-			if not name.startswith('__'):
-				prop = getattr(self.__class__, name)
-				if isinstance(prop, property):
-					prop = getattr(self, name)
-					self.ctx.self[name] = await prop if inspect.isawaitable(prop) else prop
-				elif o.Type(prop).is_atomic():
-					self.ctx.self[name] = prop
+		cls = self.__class__
+
+		for name in cls.__ww_props__:
+			prop = getattr(self, name)
+			self.ctx.self[name] = await prop if inspect.isawaitable(prop) else prop
+
+		for name in cls.__ww_atomics__:
+			self.ctx.self[name] = getattr(cls, name)
 
 	# ----------------------------------------------------------------------
 	async def _fill(self, template=None):
@@ -114,10 +148,8 @@ class Agent(ww.base.Operator):
 		template = template or self.template
 
 		try:
-			template = ww.String.unindent(template)
-			env      = self._make_env()
-			jinja    = env.from_string(template)
-			prompt   = ww.String.unindent(jinja.render(ctx=self.ctx))
+			jinja  = self._compile(template)
+			prompt = ww.String.unindent(jinja.render(ctx=self.ctx))
 		except Exception as e:
 			raise ValueError(
 				f'Template fill failed in `{self.__ww_module__}`: {str(e)}'
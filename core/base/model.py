@@ -2,11 +2,15 @@
 # Model base class
 # ======================================================================
 
+import asyncio
+
 import ww
 
 
 class Model(ww.Module):
 
+	batch_concurrency = 4                               # Prompts in flight in generate_batch
+
 	# ------------------------------------------------------------------
 	def __init__(self, model_name):
 		self.model_name = model_name
@@ -21,35 +25,60 @@ class Model(ww.Module):
 		schema,
 		system      = None,
 		temperature = 0.0,
-		verbose     = True
+		verbose     = True,
+		on_field    = None,
+		cache       = None
 	):
 
 		self.verbose = verbose
 		if self.verbose: print(f'\n========================[ 😎 ]========================\n')
 
 		system_prompt = self._get_system_prompt(system, schema)
-
-		messages = [
-			{'role': 'system', 'content': system_prompt},
-			{'role': 'user',   'content': prompt}
-		]
+		messages      = self._get_messages(prompt, system_prompt)
 
 		print(f'{"-"*50}\nUSER PROMPT:\n{"-"*50}\n{prompt}')
 		print(f'{"-"*50}\nSYSTEM PROMPT:\n{"-"*50}\n{system_prompt}')
 
 		if self.verbose: print(f'\n=====================[ {self.model_name} ]=====================')
 		
-		response = await self.generate_json(
+		response = await self._generate_cached(
 			messages    = messages,
 			schema      = schema,
 			temperature = temperature,
-			verbose     = verbose
+			verbose     = verbose,
+			on_field    = on_field,
+			cache       = cache
 		)
 
 		print(response)
 
 		return response
 
+	# Generate many prompts with bounded concurrency.
+	# Identical prompts are generated once, results keep input order,
+	# failed items hold their exception instead of cancelling others.
+	# ------------------------------------------------------------------
+	async def generate_batch(
+		self,
+		prompts,
+		schema,
+		system      = None,
+		temperature = 0.0,
+		concurrency = None,
+		cache       = None
+	):
+		system_prompt = self._get_system_prompt(system, schema)
+		unique        = list(dict.fromkeys(prompts))
+		semaphore     = asyncio.Semaphore(concurrency or self.batch_concurrency)
+
+		results = await asyncio.gather(*[
+			self._generate_item(prompt, schema, system_prompt, temperature, semaphore, cache)
+			for prompt in unique
+		])
+
+		by_prompt = dict(zip(unique, results))
+		return [by_prompt[prompt] for prompt in prompts]
+
 	# ======================================================================
 	# PRIVATE METHODS
 	# ======================================================================
@@ -66,6 +95,66 @@ class Model(ww.Module):
 
 		return default_prompt if system is None else system
 
+	# ------------------------------------------------------------------
+	def _get_messages(self, prompt, system_prompt):
+		return [
+			{'role': 'system', 'content': system_prompt},
+			{'role': 'user',   'content': prompt}
+		]
+
+	# One quiet batch item, exception is returned instead of raised
+	# ------------------------------------------------------------------
+	async def _generate_item(self, prompt, schema, system_prompt, temperature, semaphore, cache):
+		async with semaphore:
+			try:
+				result = await self._generate_cached(
+					messages    = self._get_messages(prompt, system_prompt),
+					schema      = schema,
+					temperature = temperature,
+					verbose     = False,
+					cache       = cache
+				)
+			except Exception as e:
+				result = e
+
+		return result
+
+	# Provider call behind persistent response cache.
+	# By default only deterministic calls (temperature 0) are cached,
+	# `cache=True` opts sampled calls in, `cache=False` bypasses.
+	# ------------------------------------------------------------------
+	async def _generate_cached(self, messages, schema, temperature, verbose, on_field=None, cache=None):
+		result = None
+
+		if cache is None:
+			cache = temperature == 0
+
+		if cache:
+			key = ww.services.LlmCache.key(
+				f'{self.__class__.__name__}:{self.model_name}',
+				messages,
+				schema.to_prompt(),
+				temperature
+			)
+			result = ww.services.LlmCache.get(key)
+
+			if result is not None and on_field:
+				for field, value in result.items():
+					on_field(field, value)
+
+		if result is None:
+			result = await self.generate_json(
+				messages    = messages,
+				schema      = schema,
+				temperature = temperature,
+				verbose     = verbose,
+				on_field    = on_field
+			)
+			if cache:
+				ww.services.LlmCache.set(key, result)
+
+		return result
+
 	# ------------------------------------------------------------------
 
 	async def _generate_json(self, messages, schema, temperature, verbose):
@@ -1,7 +1,7 @@
 import os, json, inspect
 from datetime import datetime
 
-import ww
+import ww, o
 
 
 class OperatorMeta(type(ww.Module)):
@@ -18,8 +18,34 @@ class OperatorMeta(type(ww.Module)):
 				if inspect.isfunction(attr):
 					if not inspect.iscoroutinefunction(attr):
 						raise TypeError(f'Method `{name}.{attr_name}` must be async')
+
+		mcls._introspect(cls)
 		return cls
 
+	# Precompute per-class properties, atomic attributes and invoke signature,
+	# so calls only evaluate values
+	# ----------------------------------------------------------------------
+	@staticmethod
+	def _introspect(cls):
+		props   = []
+		atomics = []
+
+		for attr_name in dir(cls):
+			if not attr_name.startswith('__'):
+				attr = getattr(cls, attr_name)
+				if isinstance(attr, property):
+					props.append(attr_name)
+				elif o.Type(attr).is_atomic():
+					atomics.append(attr_name)
+
+		signature = inspect.signature(cls.invoke)
+		params    = list(signature.parameters.values())[1:]   # Drop `self`
+
+		cls.__ww_props__     = tuple(props)
+		cls.__ww_atomics__   = tuple(atomics)
+		cls.__ww_signature__ = signature.replace(parameters=params)
+		cls.__ww_params__    = tuple((param.name, param.kind) for param in params)
+
 
 class Operator(ww.Module, metaclass=OperatorMeta):
 
@@ -4,7 +4,9 @@
 
 import json, dirtyjson
 import re
+import asyncio
 
+import httpx
 from ollama import AsyncClient
 
 import ww
@@ -12,10 +14,73 @@ import ww
 
 class Ollama(ww.base.Model):
 
+	max_connections   = 16                              # Pool size per host
+	batch_concurrency = 4                               # Match server OLLAMA_NUM_PARALLEL
+	max_keepalive     = 16                              # Idle connections kept open
+	keepalive_expiry  = 300                             # Idle connection lifetime, seconds
+	http2             = False                           # Requires `h2` package
+	keep_alive        = '30m'                           # How long server keeps model loaded
+
+	clients = {}                                        # host → (client, loop), shared by instances
+	guards  = {}                                        # host → task closing client at loop shutdown
+
 	# ------------------------------------------------------------------
-	def __init__(self, model_name, host = 'http://localhost:11434'):
+	def __init__(self, model_name, host = 'http://localhost:11434', keep_alive = None):
 		super().__init__(model_name)
-		self.host = host
+		self.host       = host
+		self.keep_alive = Ollama.keep_alive if keep_alive is None else keep_alive
+
+	# Get pooled client for host, recreated if event loop changed
+	# ------------------------------------------------------------------
+	def _get_client(self):
+		loop          = asyncio.get_running_loop()
+		client, owner = Ollama.clients.get(self.host, (None, None))
+
+		if client is None or owner is not loop:
+			if client is not None:
+				self._discard(client, owner)
+
+			client = AsyncClient(
+				host   = self.host,
+				http2  = self.http2,
+				limits = httpx.Limits(
+					max_connections           = self.max_connections,
+					max_keepalive_connections = self.max_keepalive,
+					keepalive_expiry          = self.keepalive_expiry,
+				),
+			)
+			Ollama.clients[self.host] = (client, loop)
+			Ollama.guards[self.host]  = loop.create_task(Ollama._guard(self.host, client))
+
+		return client
+
+	# Close client replaced after loop change, on loop that owns it
+	# ------------------------------------------------------------------
+	def _discard(self, client, owner):
+		guard = Ollama.guards.pop(self.host, None)
+
+		if not owner.is_closed():                       # Closed loop: guard already ran
+			if guard is not None:
+				owner.call_soon_threadsafe(guard.cancel)
+			asyncio.run_coroutine_threadsafe(Ollama._close_client(client), owner)
+
+	# ------------------------------------------------------------------
+	@staticmethod
+	async def _close_client(client):
+		if not client._client.is_closed:
+			await client._client.aclose()
+
+	# Wait until event loop shuts down (asyncio.run cancels leftover
+	# tasks), then close client and forget it
+	# ------------------------------------------------------------------
+	@staticmethod
+	async def _guard(host, client):
+		try:
+			await asyncio.Event().wait()
+		finally:
+			if Ollama.clients.get(host, (None, None))[0] is client:
+				del Ollama.clients[host]
+			await Ollama._close_client(client)
 
 	# ------------------------------------------------------------------
 	def _sanitize(self, text):
@@ -38,56 +103,93 @@ class Ollama(ww.base.Model):
 	# ==================================================================
 
 	async def warmup(self):
-		await AsyncClient(host=self.host).generate(
-			model   = self.model_name,
-			prompt  = ' ',
-			options = {'keep_alive': -1}
+		await self._get_client().generate(
+			model      = self.model_name,
+			prompt     = ' ',
+			keep_alive = -1
 		)
 
+	# Close pooled clients of all hosts
+	# ------------------------------------------------------------------
+	@classmethod
+	async def close(cls):
+		loop = asyncio.get_running_loop()
+
+		for client, owner in cls.clients.values():
+			if owner is loop:
+				await cls._close_client(client)
+			elif not owner.is_closed():
+				asyncio.run_coroutine_threadsafe(cls._close_client(client), owner)
+
+		for guard in cls.guards.values():
+			if not guard.get_loop().is_closed():
+				guard.get_loop().call_soon_threadsafe(guard.cancel)
+
+		cls.guards.clear()
+		cls.clients.clear()
+
 	async def generate_json(
 		self,
 		messages,
 		schema,
 		temperature,
-		verbose
+		verbose,
+		on_field = None
 	):
 		params = {
 			'model'    : self.model_name,
 			'messages' : messages,
 			'format'   : schema,
-			'options'  : {'temperature': temperature, 'keep_alive': 60}
+			'options'  : {'temperature': temperature}
 		}
 
-		client        = AsyncClient(host=self.host)
-		full_content  = ''
-
-		async for part in await client.chat(
-			model    = self.model_name,
-			messages = params['messages'],
-			options  = params['options'],
-			stream   = True,
-		):
-			chunk = part['message']['content']
-			if self.verbose: print(chunk, end='', flush=True)
-			full_content += chunk
+		client = self._get_client()
+		parser = ww.parsers.JsonStream()
+		raw    = []
 
-		if self.verbose: print('\n' + '-' * 30)
-		safe_content = self._sanitize(full_content)
+		stream = await client.chat(
+			model      = self.model_name,
+			messages   = params['messages'],
+			options    = params['options'],
+			keep_alive = self.keep_alive,
+			stream     = True,
+		)
 
 		try:
-			return json.loads(safe_content)
-		except Exception:
-			match = re.search(
-				r'({.*?}|\[.*?\])',
-				safe_content,
-				re.DOTALL
-			)
-			if match:
-				try:
-					return dirtyjson.loads(match.group(1))
-				except Exception as e2:
-					self.print('‼️ JSON fallback parse error:', e2)
+			async for part in stream:
+				chunk = part['message']['content']
+				if verbose: print(chunk, end='', flush=True)
+				raw.append(chunk)
+
+				for key, value in parser.feed(chunk):
+					if on_field: on_field(key, value)   # Early top-level field
 
-			self.print('‼️ Model output parse fail, RAW:\n', safe_content)
+				if parser.done:
+					break                                # Root closed, stop generation
+		finally:
+			await stream.aclose()
 
-			raise ValueError('No valid JSON found in model output')
+		if verbose: print('\n' + '-' * 30)
+
+		try:
+			return parser.load()
+		except Exception:
+			safe_content = self._sanitize(parser.text if parser.started else ''.join(raw))
+
+			try:
+				return json.loads(safe_content)
+			except Exception:
+				match = re.search(
+					r'({.*?}|\[.*?\])',
+					safe_content,
+					re.DOTALL
+				)
+				if match:
+					try:
+						return dirtyjson.loads(match.group(1))
+					except Exception as e2:
+						self.print('‼️ JSON fallback parse error:', e2)
+
+				self.print('‼️ Model output parse fail, RAW:\n', safe_content)
+
+				raise ValueError('No valid JSON found in model output')
@@ -3,19 +3,55 @@
 # ======================================================================
 
 import json
+import random
 import asyncio
 
-from openai import OpenAI
+import openai
+from openai import AsyncOpenAI
 
-from wordwield.core import Model
+import ww
 
 
-class OpenaiModel(Model):
+class OpenaiModel(ww.base.Model):
+
+	concurrency = 16                                    # Max requests in flight
+	retries     = 5                                     # Retries on 429 / 5xx / connection errors
+	backoff     = 0.5                                   # First retry delay, seconds (doubles)
+	stream      = False                                 # Stream tokens as they arrive
 
 	# ------------------------------------------------------------------
-	def __init__(self, model_name = 'gpt-4o'):
+	def __init__(
+		self,
+		model_name  = 'gpt-4o',
+		base_url    = None,
+		api_key     = None,
+		concurrency = None,
+		stream      = None
+	):
 		super().__init__(model_name)
-		self.client = OpenAI()
+		self.base_url    = base_url
+		self.api_key     = api_key
+		self.concurrency = concurrency or OpenaiModel.concurrency
+		self.batch_concurrency = self.concurrency       # Bounded by semaphore anyway
+		self.stream      = OpenaiModel.stream if stream is None else stream
+		self.client      = None
+		self.semaphore   = None
+		self.loop        = None
+
+	# Client and semaphore bound to running loop, recreated if it changed
+	# ------------------------------------------------------------------
+	def _get_client(self):
+		loop = asyncio.get_running_loop()
+
+		if self.client is None or self.loop is not loop:
+			if self.client is not None and not self.loop.is_closed():
+				asyncio.run_coroutine_threadsafe(self.client.close(), self.loop)
+
+			self.client    = AsyncOpenAI(base_url=self.base_url, api_key=self.api_key, max_retries=0)
+			self.semaphore = asyncio.Semaphore(self.concurrency)
+			self.loop      = loop
+
+		return self.client
 
 	# ------------------------------------------------------------------
 	def _to_json_schema(self, schema):
@@ -32,16 +68,67 @@ class OpenaiModel(Model):
 			}
 		}
 
+	# Is error worth retrying (rate limit, server error, network)?
+	# ------------------------------------------------------------------
+	def _is_retryable(self, e):
+		if isinstance(e, openai.APIStatusError):
+			return e.status_code == 429 or e.status_code >= 500
+		return isinstance(e, openai.APIConnectionError)
+
+	# Delay before next attempt, honoring Retry-After
+	# ------------------------------------------------------------------
+	def _delay(self, e, attempt):
+		delay    = self.backoff * 2 ** attempt
+		response = getattr(e, 'response', None)
+
+		if response is not None:
+			try              : delay = max(delay, float(response.headers.get('retry-after')))
+			except Exception : pass
+
+		return delay + random.uniform(0, delay / 4)
+
+	# Single request, streamed or not, returns message content.
+	# Fields in `reported` were sent to `on_field` by earlier attempt.
+	# ------------------------------------------------------------------
+	async def _complete(self, client, params, verbose, on_field=None, reported=None):
+		if not self.stream:
+			response = await client.chat.completions.create(**params)
+			return response.choices[0].message.content
+
+		parser = ww.parsers.JsonStream()
+		chunks = []
+
+		async for part in await client.chat.completions.create(**params, stream=True):
+			if part.choices and (chunk := part.choices[0].delta.content):
+				if verbose: print(chunk, end='', flush=True)
+				chunks.append(chunk)
+
+				for key, value in parser.feed(chunk):
+					if on_field and key not in reported:   # Early top-level field, once per call
+						reported.add(key)
+						on_field(key, value)
+
+		if verbose: print('\n' + '-' * 30)
+		return ''.join(chunks)
+
 	# ==================================================================
 	# PROVIDER ENTRY
 	# ==================================================================
 
+	# Close client of current loop
+	# ------------------------------------------------------------------
+	async def close(self):
+		if self.client is not None and self.loop is asyncio.get_running_loop():
+			await self.client.close()
+		self.client = None
+
 	async def generate_json(
 		self,
 		messages,
 		schema,
 		temperature,
-		verbose
+		verbose,
+		on_field = None
 	):
 
 		params = {
@@ -51,14 +138,21 @@ class OpenaiModel(Model):
 			'messages'        : messages
 		}
 
+		client   = self._get_client()
+		reported = set()                                # Streamed fields survive retries
+
 		try:
-			response = await asyncio.to_thread(
-				self.client.chat.completions.create,
-				**params
-			)
-			result = json.loads(
-				response.choices[0].message.content
-			)
+			for attempt in range(self.retries + 1):
+				try:
+					async with self.semaphore:             # Slot is released while backing off
+						content = await self._complete(client, params, verbose, on_field, reported)
+					break
+				except Exception as e:
+					if attempt == self.retries or not self._is_retryable(e):
+						raise
+					await asyncio.sleep(self._delay(e, attempt))
+
+			result = json.loads(content)
 
 		except json.JSONDecodeError as e:
 			raise ValueError(
@@ -0,0 +1,111 @@
+# ======================================================================
+# JsonStream — incremental JSON reader for streamed LLM output.
+# ======================================================================
+
+import json
+
+
+class JsonStream:
+	'''
+	Consumes chunks as they arrive, skipping anything before root object.
+	Reports top-level fields as soon as they are complete
+	and marks itself done when root object closes.
+	'''
+
+	# ------------------------------------------------------------------
+	def __init__(self):
+		self.chunks    = []                             # Root object text, chunked
+		self.pending   = []                             # Current top-level field, chunked
+		self.fields    = {}                             # Completed top-level fields
+		self.depth     = 0
+		self.in_string = False
+		self.escape    = False
+		self.started   = False
+		self.done      = False
+
+	# ==================================================================
+	# PRIVATE METHODS
+	# ==================================================================
+
+	# Parse `"key": value` text of completed top-level field
+	# ------------------------------------------------------------------
+	def _close_field(self, fields):
+		text         = ''.join(self.pending).strip()
+		self.pending = []
+
+		if text:
+			try:
+				field = json.loads('{' + text + '}', strict=False)
+				self.fields.update(field)
+				fields.extend(field.items())
+			except json.JSONDecodeError:
+				pass                                    # Left for full parse fallback
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Consume chunk, return list of (key, value) fields completed by it
+	# ------------------------------------------------------------------
+	def feed(self, chunk):
+		fields = []
+		start  = 0
+
+		if not self.done and not self.started:
+			start = chunk.find('{')
+			if start == -1:
+				return fields
+			self.started = True
+			self.depth   = 1
+			self.chunks.append('{')
+			start += 1
+
+		if self.done:
+			return fields
+
+		mark = start                                    # Start of unconsumed field text
+
+		for i in range(start, len(chunk)):
+			c = chunk[i]
+
+			if self.in_string:
+				if self.escape     : self.escape    = False
+				elif c == '\\'     : self.escape    = True
+				elif c == '"'      : self.in_string = False
+
+			elif c == '"':
+				self.in_string = True
+
+			elif c in '{[':
+				self.depth += 1
+
+			elif c in '}]':
+				self.depth -= 1
+
+				if self.depth == 0:
+					self.pending.append(chunk[mark:i])
+					self.chunks.append(chunk[start:i+1])
+					self._close_field(fields)
+					self.done = True
+					return fields
+
+			elif c == ',' and self.depth == 1:
+				self.pending.append(chunk[mark:i])
+				self._close_field(fields)
+				mark = i + 1
+
+		self.pending.append(chunk[mark:])
+		self.chunks.append(chunk[start:])
+
+		return fields
+
+	# Root object text consumed so far
+	# ------------------------------------------------------------------
+	@property
+	def text(self):
+		return ''.join(self.chunks)
+
+	# Parse complete root object
+	# ------------------------------------------------------------------
+	def load(self):
+		return json.loads(self.text, strict=False)
@@ -1,3 +1,6 @@
+import numpy as np
+import torch
+
 import ww, o, yo
 
 o.T.SemanticDocument
@@ -14,6 +17,25 @@ class SemanticAtom(o.Schema):
 	# PUBLIC METHODS
 	# ======================================================================
 
+	# Save many atoms through o's save path. Vectors are converted in one
+	# NumPy pass into rows of a single float32 matrix, so serialization of
+	# each row is a plain buffer copy. Call inside o.Db transaction.
+	# ----------------------------------------------------------------------
+	@classmethod
+	def save_all(cls, atoms):
+		if atoms:
+			vectors = np.stack([
+				atom.vector.detach().cpu().numpy() if isinstance(atom.vector, torch.Tensor) else np.asarray(atom.vector)
+				for atom in atoms
+			]).astype(np.float32, copy=False)
+			vectors = torch.from_numpy(np.ascontiguousarray(vectors))
+
+			for atom, vector in zip(atoms, vectors):
+				atom.vector = vector
+				atom.save()
+
+		return atoms
+
 	# Remove atom
 	# ----------------------------------------------------------------------
 	@o.dual_method
@@ -1,3 +1,5 @@
+from time import time
+
 import o
 
 
@@ -6,6 +8,7 @@ class SemanticDocument(o.Schema):
 	description = o.F(str, default=None)
 	mtime       = o.F(int)
 	created     = o.F(int)
+	digest      = o.F(str, default=None)
 
 	# ======================================================================
 	# PUBLIC METHODS
@@ -16,22 +19,44 @@ class SemanticDocument(o.Schema):
 	def get_atoms(self):
 		return o.T.SemanticAtom.get_all(document=self)
 
-	# Add atoms to document
+	# Texts of given document atoms, one query for all of them
 	# ----------------------------------------------------------------------
-	def add_atoms(self, texts, vectors):
-		ids = []
+	def get_texts(self, atom_ids):
+		ids    = {int(atom_id) for atom_id in atom_ids}
+		result = {atom.id: atom.text for atom in self.get_atoms() if atom.id in ids}
+		return result
 
-		for item_id in range(len(texts)):
-			atom = o.T.SemanticAtom(
+	# Add atoms to document in one bulk write
+	# ----------------------------------------------------------------------
+	def add_atoms(self, texts, vectors):
+		atoms = [
+			o.T.SemanticAtom(
 				document = self,
 				item_id  = item_id,
 				text     = texts[item_id],
 				vector   = vectors[item_id],
-			).save()
-			ids.append(atom.id)
+			)
+			for item_id in range(len(texts))
+		]
+
+		o.T.SemanticAtom.save_all(atoms)
+		ids = [atom.id for atom in atoms]
 
 		return ids
 
+	# Stamp creation time
+	# ----------------------------------------------------------------------
+	@classmethod
+	def on_create(cls, data):
+		result = data
+
+		if isinstance(result, dict):
+
+			if result.get('created') is None:
+				result['created'] = int(time())
+
+		return result
+
 	# Delete with cascade
 	# ----------------------------------------------------------------------
 	def remove(self):
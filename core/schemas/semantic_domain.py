@@ -5,6 +5,9 @@ class SemanticDomain(o.Schema):
 	description = o.F(str,  default='')
 	temporary   = o.F(bool, default=True)
 	created     = o.F(int)
+	accessed    = o.F(int,  default=None)
+	atoms       = o.F(int,  default=0)
+	complete    = o.F(bool, default=False)
 
 	# ======================================================================
 	# PUBLIC METHODS
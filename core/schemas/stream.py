@@ -2,55 +2,316 @@
 # Stream — ordered sequence of gulps.
 # ======================================================================
 
-import os
+import os, json, heapq, asyncio, threading
+from bisect    import bisect_right
+from itertools import islice, repeat
 
 import o
 from wordwield import ww
 
 
+# ======================================================================
+# Segment — append-only gulp log of one stream.
+# ======================================================================
+
+class _Segment:
+	'''
+	One JSON line per gulp, appended in timestamp order.
+	In-memory (timestamp → byte offset) index serves range reads,
+	pending gulps are written on flush.
+	Flush may run in worker thread: gulps stay pending until their
+	index entries exist, state changes happen under lock.
+	'''
+
+	# ----------------------------------------------------------------------
+	def __init__(self, path):
+		self.path       = path
+		self.timestamps = []                            # Sorted gulp timestamps
+		self.offsets    = []                            # Byte offset of each gulp line
+		self.pending    = []                            # Written, not flushed
+		self.authors    = {}                            # Author → index of last gulp
+		self.size       = 0
+		self.lock       = threading.Lock()              # Guards index and pending
+		self.flushing   = threading.Lock()              # One flush at a time
+
+		if os.path.exists(path):
+			with open(path, 'rb') as f:
+				for line in f:
+					data = json.loads(line)
+					self.authors[data['author']] = len(self.timestamps)
+					self.timestamps.append(data['timestamp'])
+					self.offsets.append(self.size)
+					self.size += len(line)
+
+	# ----------------------------------------------------------------------
+	def __len__(self):
+		return len(self.timestamps) + len(self.pending)
+
+	# Queue gulp, keep timestamps non-decreasing
+	# ----------------------------------------------------------------------
+	def append(self, gulp):
+		with self.lock:
+			last = self.pending[-1].timestamp if self.pending else (
+				self.timestamps[-1] if self.timestamps else None
+			)
+			if last is not None and gulp.timestamp < last:
+				gulp.timestamp = last
+
+			self.authors[gulp.author] = len(self)
+			self.pending.append(gulp)
+
+	# Write pending gulps with one file open, return them.
+	# Gulps leave `pending` only once indexed, so readers never miss them.
+	# ----------------------------------------------------------------------
+	def flush(self):
+		with self.flushing:
+			with self.lock:
+				gulps = list(self.pending)
+
+			if gulps:
+				lines = [
+					(json.dumps({
+						'timestamp' : g.timestamp,
+						'value'     : g.value,
+						'author'    : g.author
+					}, ensure_ascii=False) + '\n').encode('utf-8')
+					for g in gulps
+				]
+
+				with open(self.path, 'ab') as f:
+					f.write(b''.join(lines))
+
+				with self.lock:
+					for g, line in zip(gulps, lines):
+						self.timestamps.append(g.timestamp)
+						self.offsets.append(self.size)
+						self.size += len(line)
+					del self.pending[:len(gulps)]
+
+		return gulps
+
+	# Flushed gulps in index range [start:stop]
+	# ----------------------------------------------------------------------
+	def _read_flushed(self, start, stop, offset):
+		gulps = []
+
+		if start < stop:
+			with open(self.path, 'rb') as f:
+				f.seek(offset)
+				for line in islice(f, stop - start):      # Lines written past index are still pending
+					gulps.append(Gulp(**json.loads(line)))
+
+		return gulps
+
+	# Gulps from index on, flushed and pending
+	# ----------------------------------------------------------------------
+	def read_from(self, start):
+		with self.lock:
+			flushed = len(self.offsets)
+			offset  = self.offsets[start] if start < flushed else 0
+			pending = self.pending[max(start - flushed, 0):]
+
+		return self._read_flushed(start, flushed, offset) + pending
+
+	# Gulps newer than `since`, last `limit` of them, via index range scan
+	# ----------------------------------------------------------------------
+	def read(self, since=None, limit=None):
+		with self.lock:
+			flushed = len(self.offsets)
+			pending = [g for g in self.pending if since is None or g.timestamp > since]
+			start   = bisect_right(self.timestamps, since) if since is not None else 0
+
+			if limit is not None and limit > 0:
+				if limit <= len(pending):
+					return pending[len(pending) - limit:]
+				start = max(start, flushed - (limit - len(pending)))
+
+			offset = self.offsets[start] if start < flushed else 0
+
+		return self._read_flushed(start, flushed, offset) + pending
+
+
+_segments = {}                                          # stream name → segment
+_authors  = {}                                          # stream name → author index of record gulps
+
+
+# ======================================================================
+# StreamView — read-only window over stream gulps.
+# ======================================================================
+
+class StreamView:
+	'''
+	Slice [start:stop] of a timestamp-sorted gulp list.
+	Shares list with its stream, gulps are copied only when listed.
+	'''
+
+	is_zipped = True                                    # Views are read-only
+
+	# ----------------------------------------------------------------------
+	def __init__(self, stream, gulps, start=0, stop=None):
+		self.stream = stream
+		self.name   = stream.name
+		self.role   = stream.role
+		self.author = stream.author
+		self.items  = gulps
+		self.start  = start
+		self.stop   = len(gulps) if stop is None else stop
+
+	# ----------------------------------------------------------------------
+	def __len__(self):
+		return max(self.stop - self.start, 0)
+
+	# ----------------------------------------------------------------------
+	def __iter__(self):
+		return islice(self.items, self.start, self.stop)
+
+	# ======================================================================
+	# PUBLIC METHODS
+	# ======================================================================
+
+	# Gulps of view
+	# ----------------------------------------------------------------------
+	@property
+	def gulps(self):
+		return self.items[self.start:self.stop]
+
+	# Narrow view to gulps since timestamp
+	# ----------------------------------------------------------------------
+	def since(self, timestamp):
+		start = bisect_right(self.items, timestamp, self.start, self.stop, key=lambda g: g.timestamp)
+		return StreamView(self.stream, self.items, start, self.stop)
+
+	# Narrow view to last n gulps
+	# ----------------------------------------------------------------------
+	def last(self, n=1):
+		start = max(self.start, self.stop - n) if n > 0 else self.start
+		return StreamView(self.stream, self.items, start, self.stop)
+
+	# Return last gulp
+	# ----------------------------------------------------------------------
+	def last_gulp(self):
+		return self.items[self.stop - 1] if len(self) else None
+
+	# Read gulps with filters
+	# ----------------------------------------------------------------------
+	def read(self, limit=None, since=None):
+		view = self.since(since) if since is not None else self
+		view = view.last(int(limit)) if limit is not None else view
+		return view.gulps
+
+	# ----------------------------------------------------------------------
+	def write(self, values):
+		raise RuntimeError(f'🛑 Cannot write to stream view `{self.name}`')
+
+	# Convert to list of values
+	# ----------------------------------------------------------------------
+	def to_list(self):
+		return [g.value for g in self]
+
+	# Convert to prompt
+	# ----------------------------------------------------------------------
+	def to_prompt(self):
+		return '\n'.join([g.to_prompt() for g in self])
+
+
 class Stream(o.Schema):
-	name      = o.F(str)
-	role      = o.F(str)
-	gulps     = o.F(list[Gulp], default_factory=list)
-	author    = o.F(str)
-	is_zipped = False
+	name        = o.F(str)
+	role        = o.F(str)
+	gulps       = o.F(list[Gulp], default_factory=list)
+	author      = o.F(str)
+	append_only = o.F(bool, default=False)              # Gulps live in log segment, not in record
+	is_zipped   = False
+	flush_size  = 256                                   # Auto-flush threshold of append-only writes
 
 	# ----------------------------------------------------------------------
 	def __len__(self):
-		result = len(self.gulps or [])
+		result = len(self._segment()) if self.append_only else len(self.gulps or [])
 		return result
 
 	# ======================================================================
 	# PRIVATE METHODS
 	# ======================================================================
 
-	# Create substream from gulps
+	# Log segment of append-only stream
 	# ----------------------------------------------------------------------
-	def _gulps_to_stream(self, gulps):
-		result = Stream(
-			name   = self.name,
-			role   = self.role,
-			gulps  = gulps,
-			author = self.author
-		)
+	def _segment(self):
+		if self.name not in _segments:
+			path = os.path.join(ww.config.LOGS_DIR, f'{self.name}.gulps.jsonl')
+			_segments[self.name] = _Segment(path)
+
+		return _segments[self.name]
+
+	# View of gulps since timestamp, last `limit` of them.
+	# Record gulps are timestamp-sorted, so `since` is a bisect.
+	# ----------------------------------------------------------------------
+	def _view(self, since=None, limit=None):
+		if self.append_only:
+			result = StreamView(self, self._segment().read(since, limit))
+		else:
+			gulps = self.gulps or []
+			start = 0 if since is None else bisect_right(gulps, since, key=lambda g: g.timestamp)
+
+			if limit is not None and limit > 0:
+				start = max(start, len(gulps) - limit)
+
+			result = StreamView(self, gulps, start)
+
 		return result
 
+	# Gulps since timestamp, last `limit` of them
+	# ----------------------------------------------------------------------
+	def _read(self, since=None, limit=None):
+		return self._view(since, limit).gulps
+
+	# Index of last gulp of author, kept incrementally for record gulps
+	# ----------------------------------------------------------------------
+	def _last_index(self, author):
+		if self.append_only:
+			return self._segment().authors.get(author)
+
+		gulps = self.gulps or []
+		index = _authors.get(self.name)
+
+		if index is None or index['gulps'] is not gulps or index['size'] > len(gulps):
+			index = _authors[self.name] = {'gulps': gulps, 'size': 0, 'authors': {}}
+
+		for i in range(index['size'], len(gulps)):     # Only gulps appended since last call
+			index['authors'][gulps[i].author] = i
+
+		index['size'] = len(gulps)
+		return index['authors'].get(author)
+
 	# ======================================================================
 	# PUBLIC METHODS
 	# ======================================================================
 
-	# Zip multiple streams
+	# Zip multiple streams: lazy k-way merge of already sorted streams.
+	# `since` / `limit` are pushed down, so only tails are read.
+	# `limit` <= 0 means all gulps, as in last().
+	# Gulps are shared, not cloned — zipped stream is read-only.
 	# ----------------------------------------------------------------------
 	@classmethod
-	def zip(cls, *names):
-		gulps = []
+	def zip(cls, *names, since=None, limit=None):
+		sources = []
+		limit   = limit if limit is not None and limit > 0 else None
 
 		for name in names:
 			if stream := cls.load(name):
-				for g in stream.gulps or []:
-					gulps.append(g.clone())
+				sources.append(stream._read(since=since, limit=limit))
+
+		# Equal timestamps are ordered by stream position in `names`
+		key = lambda item: (item[1].timestamp, item[0])
 
-		gulps.sort(key=lambda g: g.timestamp)
+		if limit is None:
+			merged = heapq.merge(*[zip(repeat(i), source) for i, source in enumerate(sources)], key=key)
+			gulps  = [g for _, g in merged]
+		else:
+			newest = heapq.merge(
+				*[zip(repeat(i), reversed(source)) for i, source in enumerate(sources)],
+				key     = key,
+				reverse = True
+			)
+			gulps  = [g for _, g in islice(newest, limit)][::-1]
 
 		result = cls(
 			name      = '+'.join(names),
@@ -61,102 +322,118 @@ class Stream(o.Schema):
 		)
 		return result
 
-	# Return gulps since timestamp
+	# Return view of gulps since timestamp
 	# ----------------------------------------------------------------------
 	def since(self, timestamp):
-		result = self._gulps_to_stream(
-			[g for g in self.gulps if g.timestamp > timestamp]
-		)
+		result = self._view(since=timestamp)
 		return result
 
-	# Return last n gulps
+	# Return view of last n gulps
 	# ----------------------------------------------------------------------
 	def last(self, n=1):
-		gulps  = self.gulps[-n:] if n > 0 else self.gulps
-		result = self._gulps_to_stream(gulps)
-
+		result = self._view(limit=n)
 		return result
 
 	# Return last gulp
 	# ----------------------------------------------------------------------
 	def last_gulp(self):
-		result = self.gulps[-1] if self.gulps else None
+		gulps  = self._read(limit=1)
+		result = gulps[-1] if gulps else None
 		return result
 
-	# Return substream since last author appearance
+	# Return view since last author appearance
 	# ----------------------------------------------------------------------
 	def since_last_author(self, author, inclusive=True):
-		gulps = self.gulps or []
-		idx = next(
-			(i for i in range(len(gulps)-1, -1, -1) if gulps[i].author == author),
-			None
-		)
+		idx = self._last_index(author)
 
 		if idx is None:
-			result = self._gulps_to_stream([])
+			result = StreamView(self, [])
+		elif self.append_only:
+			gulps  = self._segment().read_from(idx)
+			result = StreamView(self, gulps, 0 if inclusive else 1)
 		else:
-			result = self._gulps_to_stream(
-				gulps[idx:] if inclusive else gulps[idx+1:]
-			)
+			result = StreamView(self, self.gulps, idx if inclusive else idx + 1)
 
 		return result
 
-	# Write new gulps
+	# Write new gulps.
+	# Record mode: one save and one log write per call.
+	# Append-only mode: gulps are queued until flush.
 	# ----------------------------------------------------------------------
 	def write(self, values):
 		if self.is_zipped:
 			raise RuntimeError(f'🛑 Cannot write to zipped stream `{self.name}`')
 
-		if not isinstance(self.gulps, list):
-			self.gulps = []
-
 		values = [values] if isinstance(values, str) else values
-		self.gulps = self.gulps or []
 
 		for value in values:
 			if not isinstance(value, str):
 				raise ValueError(f'🛑 Cannot write non–string to stream `{self.name}`')
 
-			self.gulps.append(Gulp(
-				value  = str(value),
-				author = self.author
-			))
+		gulps = [Gulp(value=str(value), author=self.author) for value in values]
 
+		if not self.append_only and self.gulps:
+			for gulp in gulps:                          # Keep timestamps sorted for bisect
+				gulp.timestamp = max(gulp.timestamp, self.gulps[-1].timestamp)
+
+		if self.append_only:
+			segment = self._segment()
+			for gulp in gulps:
+				segment.append(gulp)
+
+			if len(segment.pending) >= self.flush_size:
+				self.flush()
+		else:
+			if not isinstance(self.gulps, list):
+				self.gulps = []
+
+			self.gulps.extend(gulps)
 			self.save()
-			self.log(value)
+			self.log(*values)
 
 		return self
 
-	# Read gulps with filters
+	# Persist queued gulps of append-only stream
 	# ----------------------------------------------------------------------
-	def read(self, limit=None, since=None):
-		stream = self
+	def flush(self):
+		gulps = self._segment().flush() if self.append_only else []
+
+		if gulps:
+			self.log(*[g.value for g in gulps])
 
-		if since is not None:
-			stream = stream.since(since)
+		return self
 
-		if limit is not None:
-			stream = stream.last(int(limit))
+	# Flush without blocking event loop
+	# ----------------------------------------------------------------------
+	async def aflush(self):
+		await asyncio.to_thread(self.flush)
+		return self
 
-		result = stream.gulps
+	# Read gulps with filters
+	# ----------------------------------------------------------------------
+	def read(self, limit=None, since=None):
+		result = self._read(
+			since = since,
+			limit = int(limit) if limit is not None else None
+		)
 		return result
 
 	# Write log file
 	# ----------------------------------------------------------------------
-	def log(self, s):
+	def log(self, *values):
 		log_path = os.path.join(ww.config.LOGS_DIR, f'{self.name}.log')
 
 		with open(log_path, 'a') as f:
-			f.write(f'{s.strip()}\n')
+			f.write(''.join(f'{s.strip()}\n' for s in values))
 
 	# Convert to list of values
 	# ----------------------------------------------------------------------
 	def to_list(self):
-		result = [g.value for g in self.gulps]
+		result = [g.value for g in self._read()]
 		return result
 
 	# Convert to prompt
 	# ----------------------------------------------------------------------
 	def to_prompt(self):
-		result = '\n'.join([g.to_prompt() for g in self.gulps])
+		result = '\n'.join([g.to_prompt() for g in self._read()])
 		return result
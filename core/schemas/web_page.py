@@ -18,6 +18,7 @@ class WebPage(o.Schema):
 	mtime      = o.F(int)
 	fetched_at = o.F(int)
 	source     = o.F(str)
+	error      = o.F(str, default=None)
 
 
 	# ----------------------------------------------------------------------
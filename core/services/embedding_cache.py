@@ -0,0 +1,177 @@
+# ======================================================================
+# EmbeddingCache — persistent content-addressed sentence embeddings.
+# Key: hash of encoder identity + normalized text, value: float32 vector.
+# Layout: fixed-size binary keys + raw float32 matrix, appended in place.
+# ======================================================================
+
+import os, json, hashlib, threading
+
+import numpy as np
+import torch
+
+import ww
+
+
+class EmbeddingCache(ww.Service):
+
+	version  = 1                                        # On-disk layout version
+	path     = None                                     # Cache dir, defaults next to DB
+	key_size = 16                                       # Bytes of sha256 kept per key
+
+	# ------------------------------------------------------------------
+	def initialize(self):
+		self.path     = EmbeddingCache.path or os.path.splitext(ww.Conf.DB_PATH)[0] + '.emb'
+		self.lock     = threading.Lock()
+		self.identity = None
+		self.dim      = None
+		self.rows     = {}                              # key → row index
+		self.count    = 0                               # rows stored on disk
+		self.vectors  = None                            # memory-mapped rows on disk at open
+		self.fresh    = {}                              # row index → vector appended since open
+		self.hits     = 0
+		self.misses   = 0
+
+	# ==================================================================
+	# PRIVATE METHODS
+	# ==================================================================
+
+	# Path of file inside cache directory
+	# ------------------------------------------------------------------
+	def _file(self, name):
+		return os.path.join(self.path, name)
+
+	# Open cache for encoder, reset it when identity or layout changed
+	# ------------------------------------------------------------------
+	def _open(self, identity, dim):
+		if self.identity == identity and self.dim == dim:
+			return
+
+		manifest = {'version': self.version, 'identity': identity, 'dim': dim}
+		self.identity, self.dim = identity, dim
+		self.rows, self.fresh, self.vectors, self.count = {}, {}, None, 0
+
+		try:
+			with open(self._file('manifest.json')) as f:
+				valid = json.load(f) == manifest
+		except (FileNotFoundError, ValueError):
+			valid = False
+
+		if not valid:
+			os.makedirs(self.path, exist_ok=True)
+			for name in ('keys.bin', 'vectors.f32'):
+				open(self._file(name), 'wb').close()
+			with open(self._file('manifest.json'), 'w') as f:
+				json.dump(manifest, f)
+			return
+
+		with open(self._file('keys.bin'), 'rb') as f:
+			data = f.read()
+
+		keys  = [data[i:i + self.key_size] for i in range(0, len(data) - self.key_size + 1, self.key_size)]
+		count = min(len(keys), os.path.getsize(self._file('vectors.f32')) // (dim * 4))
+
+		if count:
+			self.vectors = np.memmap(self._file('vectors.f32'), dtype=np.float32, mode='r', shape=(count, dim))
+			self.rows    = {key: row for row, key in enumerate(keys[:count])}
+			self.count   = count
+
+		# Drop torn tail of interrupted append
+		# - - - - - - - - - - - - - - - - - - - -
+		if count * self.key_size != len(data) or count * dim * 4 != os.path.getsize(self._file('vectors.f32')):
+			with open(self._file('keys.bin'), 'r+b') as f:
+				f.truncate(count * self.key_size)
+			with open(self._file('vectors.f32'), 'r+b') as f:
+				f.truncate(count * dim * 4)
+
+	# Key of normalized sentence text
+	# ------------------------------------------------------------------
+	def _key(self, text):
+		text = ' '.join(text.split())
+		return hashlib.sha256(f'{self.identity}\0{text}'.encode('utf-8')).digest()[:self.key_size]
+
+	# Stored vector of row
+	# ------------------------------------------------------------------
+	def _row(self, row):
+		vector = self.fresh.get(row)
+		return vector if vector is not None else self.vectors[row]
+
+	# Append new vectors to cache
+	# ------------------------------------------------------------------
+	def _add(self, vectors):
+		with self.lock:
+			vectors = {key: vector for key, vector in vectors.items() if key not in self.rows}
+
+			if vectors:
+				with open(self._file('vectors.f32'), 'ab') as f:
+					f.write(np.stack(list(vectors.values())).astype(np.float32).tobytes())
+				with open(self._file('keys.bin'), 'ab') as f:
+					f.write(b''.join(vectors))
+
+				for key, vector in vectors.items():
+					self.rows[key]          = self.count
+					self.fresh[self.count]  = vector
+					self.count             += 1
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Vectors of `positions` in `texts`, { position: float32 tensor }.
+	# Only misses go to `encode(texts, positions)`, which encodes them in
+	# their own positions of the sequence; repeats are encoded once.
+	# ------------------------------------------------------------------
+	def encode(self, texts, positions, encode, identity, dim):
+		positions = list(positions)
+
+		with self.lock:
+			self._open(identity, dim)
+			keys   = {j: self._key(texts[j]) for j in positions}
+			result = {j: self._row(self.rows[key]) for j, key in keys.items() if key in self.rows}
+
+			missing = {}                                # key → first position
+			for j in positions:
+				if j not in result:
+					missing.setdefault(keys[j], j)
+
+			self.hits   += len(positions) - len(missing)
+			self.misses += len(missing)
+
+		if missing:
+			encoded = encode(texts, list(missing.values()))
+			found   = {
+				key: np.asarray(torch.as_tensor(encoded[j]).detach().to(torch.float32).cpu(), dtype=np.float32)
+				for key, j in missing.items()
+			}
+
+			for j in positions:
+				if j not in result:
+					result[j] = found[keys[j]]
+
+			self._add(found)
+
+		result = {j: torch.from_numpy(np.array(vector, dtype=np.float32)) for j, vector in result.items()}
+		return result
+
+	# Drop all entries
+	# ------------------------------------------------------------------
+	def clear(self):
+		with self.lock:
+			for name in ('manifest.json', 'keys.bin', 'vectors.f32'):
+				try            : os.remove(self._file(name))
+				except OSError : pass
+			self.identity = None
+
+	# Hit-rate statistics
+	# ------------------------------------------------------------------
+	def stats(self):
+		with self.lock:
+			hits, misses, entries = self.hits, self.misses, len(self.rows)
+
+		total  = hits + misses
+		result = {
+			'hits'     : hits,
+			'misses'   : misses,
+			'hit_rate' : hits / total if total else 0.0,
+			'entries'  : entries,
+		}
+		return result
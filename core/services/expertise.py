@@ -2,53 +2,276 @@
 # Expertise wrapper around Rag for folder-based knowledge.
 # ======================================================================
 
+import os, asyncio, hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+	from inotify_simple import INotify, flags          # Optional, polling otherwise
+except ImportError:
+	INotify = None
+
 import ww, o, yo
 
 
 class Expertise(ww.Service):
 
+	workers       = 4                                   # Parallel sentence splitting and diffing
+	extensions    = ['md', 'txt']                       # Indexed file types
+	poll_interval = 2.0                                 # Watch: seconds between scans without inotify
+	debounce      = 0.5                                 # Watch: quiet time before applying changes
+
 	# ------------------------------------------------------------------
 	def initialize(self):
 		self.sync(ww.Conf.EXPERTISE)
 
+	# ==================================================================
+	# PRIVATE METHODS
+	# ==================================================================
+
+	# Content hash of document text
+	# ------------------------------------------------------------------
+	def _digest(self, text):
+		return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+	# Collect files of domain folder that need indexing
+	# ------------------------------------------------------------------
+	def _scan(self, entry, domain, jobs, summary):
+		fs_keys = set()
+
+		for fs_doc in entry:
+			if fs_doc.ext in self.extensions:
+				fs_keys.add(fs_doc.path)
+				domain_doc = domain.get_document(fs_doc.path)
+
+				# Same mtime, nothing to check
+				# - - - - - - - - - - - - - - - - - - - -
+				if domain_doc is not None and domain_doc.mtime == fs_doc.mtime:
+					summary['skipped'] += 1
+					continue
+
+				text   = fs_doc.load()
+				digest = self._digest(text)
+
+				# Touched but unchanged, only remember new mtime
+				# - - - - - - - - - - - - - - - - - - - -
+				if domain_doc is not None and domain_doc.digest == digest:
+					domain_doc.mtime = fs_doc.mtime
+					domain_doc.save()
+					summary['skipped'] += 1
+					continue
+
+				jobs.append((domain, domain_doc, fs_doc, text, digest))
+
+		return fs_keys
+
+	# Index new document from vectorized text
+	# ------------------------------------------------------------------
+	def _index(self, domain, key, mtime, digest, atoms):
+		self.print(f'Indexing `{key}`')
+
+		ww.services.Rag.add_document(
+			domain_id    = domain.id,
+			document_key = key,
+			text         = None,
+			mtime        = mtime,
+			digest       = digest,
+			atoms        = atoms
+		)
+
+	# Reindex changed sentences of existing document, `atoms` from Rag.reencode
+	# ------------------------------------------------------------------
+	def _update(self, domain, key, text, mtime, digest, atoms):
+		self.print(f'Updating `{key}`')
+
+		ww.services.Rag.update_document(
+			domain_id    = domain.id,
+			document_key = key,
+			text         = text,
+			mtime        = mtime,
+			digest       = digest,
+			atoms        = atoms
+		)
+
+	# Snapshot of indexed files under root: path → (mtime, size)
+	# ------------------------------------------------------------------
+	def _stat(self, root):
+		result = {}
+
+		for name in os.listdir(root):
+			domain_path = os.path.join(root, name)
+
+			if os.path.isdir(domain_path):
+				for dir_path, _, file_names in os.walk(domain_path):
+					for file_name in file_names:
+						if file_name.rsplit('.', 1)[-1] in self.extensions:
+							path = os.path.join(dir_path, file_name)
+							try:
+								stat = os.stat(path)
+								result[path] = (stat.st_mtime_ns, stat.st_size)
+							except FileNotFoundError:
+								pass                    # Removed while scanning
+
+		return result
+
+	# Inotify watcher on root and domain folders, None if unavailable
+	# ------------------------------------------------------------------
+	def _inotify(self, root):
+		result = None
+
+		if INotify is not None:
+			result = INotify()
+			mask   = (
+				flags.CREATE     | flags.MODIFY   | flags.CLOSE_WRITE |
+				flags.DELETE     | flags.MOVED_TO | flags.MOVED_FROM
+			)
+			for dir_path, _, _ in os.walk(root):
+				result.add_watch(dir_path, mask)
+
+		return result
+
+	# Wait for filesystem event, or poll interval without inotify
+	# ------------------------------------------------------------------
+	async def _wait(self, notifier):
+		if notifier is None:
+			await asyncio.sleep(self.poll_interval)
+		else:
+			await asyncio.to_thread(notifier.read, int(self.poll_interval * 1000))
+
+	# Feed touched files through add / remove document. A failing file is
+	# logged and skipped, it is retried when it changes again.
+	# ------------------------------------------------------------------
+	async def _apply(self, root, paths):
+		for path in sorted(paths):
+			try:
+				await self._apply_path(root, path)
+			except Exception as e:
+				self.print(f'‼️ Could not reindex `{path}`: {type(e).__name__}: {e}')
+
+	# Add, update or remove document of one touched file
+	# ------------------------------------------------------------------
+	async def _apply_path(self, root, path):
+		domain_name = os.path.relpath(path, root).split(os.sep)[0]
+		domain      = ww.services.Rag.add_domain(domain_name, description=f'Expertise domain {domain_name}')
+		domain_doc  = domain.get_document(path)
+
+		if not os.path.exists(path):
+			if domain_doc is not None:
+				self.print(f'Removing `{path}` (missing in fs)')
+				ww.services.Rag.remove_document(domain.id, domain_doc.id)
+			return
+
+		with open(path, encoding='utf-8', errors='ignore') as f:
+			text = f.read()
+
+		mtime  = int(os.path.getmtime(path))
+		digest = self._digest(text)
+
+		if domain_doc is None:
+			atoms = await asyncio.to_thread(ww.services.Rag.vectorize, text)
+			self._index(domain, path, mtime, digest, atoms)
+		elif domain_doc.digest == digest:
+			domain_doc.mtime = mtime
+			domain_doc.save()
+		else:
+			old   = ww.services.Rag.get_atoms(domain_doc)
+			atoms = await asyncio.to_thread(ww.services.Rag.reencode, *old, text)
+			self._update(domain, path, text, mtime, digest, atoms)
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Watch expertise folder and reindex touched files until `stop` is set.
+	# Changes are debounced, tree scans and encoding run off the event
+	# loop, so search keeps answering while watching.
+	# ------------------------------------------------------------------
+	async def watch(self, root=None, stop=None):
+		root     = root or ww.Conf.EXPERTISE.path
+		notifier = self._inotify(root)
+		state    = await asyncio.to_thread(self._stat, root)
+
+		self.print(f'Watching `{root}` ({"inotify" if notifier else "polling"})')
+
+		try:
+			while stop is None or not stop.is_set():
+				await self._wait(notifier)
+				current = await asyncio.to_thread(self._stat, root)
+
+				if current != state:
+					# Debounce: wait until tree stops changing
+					# - - - - - - - - - - - - - - - - - - - -
+					while True:
+						await asyncio.sleep(self.debounce)
+						latest = await asyncio.to_thread(self._stat, root)
+						if latest == current:
+							break
+						current = latest
+
+					touched = {
+						path for path in current.keys() | state.keys()
+						if current.get(path) != state.get(path)
+					}
+					state = current
+					await self._apply(root, touched)
+		finally:
+			if notifier is not None:
+				notifier.close()
+
+	# Index changed files, skip unchanged by content hash.
+	# Encoding runs in worker pool (new files fully, changed ones
+	# incrementally), Rag serializes the encoder calls themselves.
+	# DB reads and writes happen in this thread.
 	# ------------------------------------------------------------------
 	def sync(self, dir):
+		ww.Timer.start('sync')
+
+		summary = {'added': 0, 'updated': 0, 'removed': 0, 'skipped': 0}
+		jobs    = []
+
 		for entry in dir:
 			if entry.is_directory:
-				fs_keys = set()
 				domain  = ww.services.Rag.add_domain(entry.name, description=f'Expertise domain {entry.name}')
-
-				for fs_doc in entry:
-					if fs_doc.ext in ['md', 'txt']:
-						fs_keys.add(fs_doc.path)
-
-						# Remove if fs has newer version
-						# - - - - - - - - - - - - - - - - - - - -
-						domain_doc = domain.get_document(fs_doc.path)
-
-						if domain_doc is not None:
-							if domain_doc.mtime < fs_doc.mtime:
-								ww.services.rag.remove_document(domain.id, domain_doc.id)
-
-						# Index missing files
-						# - - - - - - - - - - - - - - - - - - - -
-						if domain.get_document(fs_doc.path) is None:
-							self.print(f'Indexing `{fs_doc.path}`')
-							ww.Timer.start('index')
-							ww.services.rag.add_document(
-								domain_id    = domain.id,
-								document_key = fs_doc.path,
-								text         = fs_doc.load(),
-								mtime        = fs_doc.mtime
-							)
-							ww.Timer.stop('index', report=True)
+				fs_keys = self._scan(entry, domain, jobs, summary)
 
 				# Remove documents missing from filesystem
 				# - - - - - - - - - - - - - - - - - - - -
 				for domain_doc in domain.get_documents():
 					if domain_doc.key not in fs_keys:
 						self.print(f'Removing `{domain_doc.key}` (missing in fs)')
-						ww.services.rag.remove_document(domain.id, domain_doc.id)
+						ww.services.Rag.remove_document(domain.id, domain_doc.id)
+						summary['removed'] += 1
+
+		# Index new files, update changed ones
+		# - - - - - - - - - - - - - - - - - - - -
+		with ThreadPoolExecutor(max_workers=self.workers) as pool:
+			futures = {}
+
+			for domain, domain_doc, fs_doc, text, digest in jobs:
+				if domain_doc is None:
+					future = pool.submit(ww.services.Rag.vectorize, text)
+				else:
+					old    = ww.services.Rag.get_atoms(domain_doc)
+					future = pool.submit(ww.services.Rag.reencode, *old, text)
+
+				futures[future] = (domain, domain_doc, fs_doc, text, digest)
+
+			for future in as_completed(futures):
+				domain, domain_doc, fs_doc, text, digest = futures[future]
+
+				if domain_doc is None:
+					self._index(domain, fs_doc.path, fs_doc.mtime, digest, future.result())
+					summary['added'] += 1
+				else:
+					self._update(domain, fs_doc.path, text, fs_doc.mtime, digest, future.result())
+					summary['updated'] += 1
+
+		summary['time'] = ww.Timer.stop('sync').get_time()
+		self.print(
+			f'Synced in {summary["time"]}s: '
+			f'{summary["added"]} added, {summary["updated"]} updated, '
+			f'{summary["removed"]} removed, {summary["skipped"]} skipped'
+		)
+		return summary
 
 	# Search within given domain
 	# ------------------------------------------------------------------
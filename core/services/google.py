@@ -3,19 +3,30 @@
 # ======================================================================
 
 import time
-import requests
+import asyncio
+
+import aiohttp
 
 import ww, o
 
 
 class Google(ww.Service):
 
+	# Search endpoint, override to point at stub server
+	url         = 'https://www.googleapis.com/customsearch/v1'
+	timeout     = 20
+	concurrency = 8                                     # Max requests in flight
+
 	# Initialize service
 	# ----------------------------------------------------------------------
 	def initialize(self):
 		self.google_api_key   = ww.Conf.GOOGLE_API_KEY
 		self.search_engine_id = ww.Conf.GOOGLE_SEARCH_ENGINE_ID
-		self.timeout          = 20
+		self.url              = Google.url
+		self.timeout          = Google.timeout
+		self.session          = None
+		self.loop             = None
+		self.inflight         = {}                      # (query, top_k) → shared task
 
 	# ======================================================================
 	# PRIVATE METHODS
@@ -45,14 +56,26 @@ class Google(ww.Service):
 		return result
 
 
+	# Pooled session bound to running loop
+	# ----------------------------------------------------------------------
+	def _get_session(self):
+		loop = asyncio.get_running_loop()
+
+		if self.session is None or self.session.closed or self.loop is not loop:
+			self.session = aiohttp.ClientSession(
+				timeout   = aiohttp.ClientTimeout(total=self.timeout),
+				connector = aiohttp.TCPConnector(limit=self.concurrency),
+			)
+			self.loop = loop
+
+		return self.session
+
 	# Perform raw Google API request
 	# ----------------------------------------------------------------------
-	def _request(self, query, top_k):
+	async def _request(self, query, top_k):
 		if not self.google_api_key or not self.search_engine_id:
 			raise RuntimeError('Google search credentials are not configured.')
 
-		url = 'https://www.googleapis.com/customsearch/v1'
-
 		params = dict(
 			key = self.google_api_key,
 			cx  = self.search_engine_id,
@@ -60,43 +83,25 @@ class Google(ww.Service):
 			num = min(top_k, 10)
 		)
 
-		response = requests.get(
-			url,
-			params  = params,
-			timeout = self.timeout
-		)
-
-		response.raise_for_status()
-
-		return response.json()
-
+		async with self._get_session().get(self.url, params=params) as response:
+			response.raise_for_status()
+			result = await response.json(content_type=None)
 
-	# ======================================================================
-	# PUBLIC METHODS
-	# ======================================================================
+		return result
 
-	# Perform Google search with DB caching
+	# Cached results or Google request. DB access stays on the loop
+	# thread, the shared o.Db session is not safe to use from workers.
 	# ----------------------------------------------------------------------
-	def search(self, query, time_range=None, top_k=5):
-
-		results = []
-
-		# --------------------------------------------------------------
-		# 1. Try cache
-		# --------------------------------------------------------------
-		cache = o.T.WebQuery.get_one(
-			query = query,
-			top_k = top_k
-		)
-
-		data = None
+	async def _fetch(self, query, top_k):
+		cache = o.T.WebQuery.get_one(query=query, top_k=top_k)
+		data  = None
 
 		if cache is not None:
 			data = cache.results
 			self.print(f'Loaded `{query}` from cache')
 		else:
 			self.print(f'Searching `{query}` via Google')
-			data = self._request(query, top_k)
+			data = await self._request(query, top_k)
 
 			o.T.WebQuery(
 				query   = query,
@@ -105,6 +110,46 @@ class Google(ww.Service):
 				created = int(time.time())
 			).save()
 
+		return data
+
+	# Forget finished in-flight request
+	# ----------------------------------------------------------------------
+	def _forget(self, key, task):
+		if self.inflight.get(key) is task:
+			del self.inflight[key]
+
+
+	# ======================================================================
+	# PUBLIC METHODS
+	# ======================================================================
+
+	# Close pooled session
+	# ----------------------------------------------------------------------
+	async def close(self):
+		if self.session is not None and not self.session.closed:
+			await self.session.close()
+		self.session = None
+
+	# Perform Google search with DB caching.
+	# Concurrent identical queries share one in-flight request.
+	# ----------------------------------------------------------------------
+	async def search(self, query, time_range=None, top_k=5):
+
+		results = []
+
+		# --------------------------------------------------------------
+		# 1. Try cache, else request (single-flight)
+		# --------------------------------------------------------------
+		key  = (query, top_k)
+		task = self.inflight.get(key)
+
+		if task is None or task.get_loop() is not asyncio.get_running_loop():
+			task = asyncio.ensure_future(self._fetch(query, top_k))
+			task.add_done_callback(lambda task: self._forget(key, task))
+			self.inflight[key] = task
+
+		data = await asyncio.shield(task)               # One caller cancelling keeps others waiting
+
 
 		# --------------------------------------------------------------
 		# 2. Filter and normalize
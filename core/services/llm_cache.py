@@ -0,0 +1,127 @@
+# ======================================================================
+# LlmCache — persistent LLM response cache (SQLite).
+# Keyed by hash of model, messages, schema and temperature.
+# ======================================================================
+
+import os, json, time, hashlib, sqlite3
+
+import ww
+
+
+class LlmCache(ww.Service):
+
+	path        = None                                  # SQLite file, defaults next to DB
+	ttl         = 30 * 24 * 3600                        # Entry lifetime, seconds, None = forever
+	max_entries = 50000                                 # LRU eviction above this size
+	evict_every = 64                                    # Writes between eviction passes
+
+	# ------------------------------------------------------------------
+	def initialize(self):
+		self.path   = LlmCache.path or os.path.splitext(ww.Conf.DB_PATH)[0] + '.llm.sqlite3'
+		self.db     = sqlite3.connect(self.path, check_same_thread=False)
+		self.hits   = 0
+		self.misses = 0
+		self.writes = 0
+
+		self.db.execute('''
+			CREATE TABLE IF NOT EXISTS llm_response (
+				key      TEXT    PRIMARY KEY,
+				value    TEXT    NOT NULL,
+				created  INTEGER NOT NULL,
+				accessed INTEGER NOT NULL
+			)
+		''')
+		self.db.execute('CREATE INDEX IF NOT EXISTS ix_llm_response_accessed ON llm_response (accessed)')
+		self.db.commit()
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Stable key for request
+	# ------------------------------------------------------------------
+	def key(self, model_name, messages, schema, temperature):
+		payload = json.dumps(
+			[model_name, messages, schema, temperature],
+			sort_keys    = True,
+			ensure_ascii = False,
+			default      = str
+		)
+		return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+	# Get cached response or None
+	# ------------------------------------------------------------------
+	def get(self, key):
+		now    = int(time.time())
+		oldest = now - self.ttl if self.ttl else 0
+		result = None
+
+		row = self.db.execute(
+			'SELECT value FROM llm_response WHERE key = ? AND created >= ?',
+			(key, oldest)
+		).fetchone()
+
+		if row is not None:
+			result = json.loads(row[0])
+			self.db.execute('UPDATE llm_response SET accessed = ? WHERE key = ?', (now, key))
+			self.db.commit()
+			self.hits += 1
+		else:
+			self.misses += 1
+
+		return result
+
+	# Store response
+	# ------------------------------------------------------------------
+	def set(self, key, value):
+		now = int(time.time())
+
+		self.db.execute(
+			'INSERT OR REPLACE INTO llm_response (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+			(key, json.dumps(value, ensure_ascii=False), now, now)
+		)
+		self.db.commit()
+
+		self.writes += 1
+		if self.writes % self.evict_every == 0:
+			self.evict()
+
+		return value
+
+	# Drop expired entries, then least recently used above max size
+	# ------------------------------------------------------------------
+	def evict(self):
+		if self.ttl:
+			self.db.execute(
+				'DELETE FROM llm_response WHERE created < ?',
+				(int(time.time()) - self.ttl,)
+			)
+
+		self.db.execute('''
+			DELETE FROM llm_response WHERE key IN (
+				SELECT key FROM llm_response
+				ORDER BY accessed DESC
+				LIMIT -1 OFFSET ?
+			)
+		''', (self.max_entries,))
+		self.db.commit()
+
+	# Drop all entries
+	# ------------------------------------------------------------------
+	def clear(self):
+		self.db.execute('DELETE FROM llm_response')
+		self.db.commit()
+
+	# Hit-rate statistics
+	# ------------------------------------------------------------------
+	def stats(self):
+		total   = self.hits + self.misses
+		entries = self.db.execute('SELECT COUNT(*) FROM llm_response').fetchone()[0]
+
+		result = {
+			'hits'     : self.hits,
+			'misses'   : self.misses,
+			'hit_rate' : self.hits / total if total else 0.0,
+			'entries'  : entries,
+		}
+		return result
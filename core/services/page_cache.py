@@ -0,0 +1,176 @@
+# ======================================================================
+# PageCache — persistent HTTP page cache (SQLite).
+# Keyed by URL, stores zlib-compressed HTML and extracted text with
+# ETag / Last-Modified validators for conditional revalidation.
+# ======================================================================
+
+import os, time, zlib, sqlite3
+
+import ww
+
+
+class PageCache(ww.Service):
+
+	path        = None                                  # SQLite file, defaults next to DB
+	fresh_for   = 3600                                  # Served without revalidation, seconds
+	ttl         = 30 * 24 * 3600                        # Entry lifetime, seconds, None = forever
+	max_bytes   = 512 * 1024 * 1024                     # LRU eviction above this compressed size
+	level       = 6                                     # zlib compression level
+	evict_every = 64                                    # Writes between eviction passes
+
+	# ------------------------------------------------------------------
+	def initialize(self):
+		self.path        = PageCache.path or os.path.splitext(ww.Conf.DB_PATH)[0] + '.pages.sqlite3'
+		self.db          = sqlite3.connect(self.path, check_same_thread=False)
+		self.hits        = 0
+		self.revalidated = 0
+		self.misses      = 0
+		self.writes      = 0
+
+		self.db.execute('''
+			CREATE TABLE IF NOT EXISTS web_page_cache (
+				url           TEXT    PRIMARY KEY,
+				html          BLOB    NOT NULL,
+				text          BLOB,
+				etag          TEXT,
+				last_modified TEXT,
+				size          INTEGER NOT NULL,
+				fetched       INTEGER NOT NULL,
+				accessed      INTEGER NOT NULL
+			)
+		''')
+		self.db.execute('CREATE INDEX IF NOT EXISTS ix_web_page_cache_accessed ON web_page_cache (accessed)')
+		self.db.commit()
+
+	# ==================================================================
+	# PRIVATE METHODS
+	# ==================================================================
+
+	# ------------------------------------------------------------------
+	def _pack(self, value):
+		return zlib.compress(value.encode('utf-8'), self.level) if value is not None else None
+
+	# ------------------------------------------------------------------
+	def _unpack(self, value):
+		return zlib.decompress(value).decode('utf-8') if value is not None else None
+
+	# ------------------------------------------------------------------
+	def _written(self):
+		self.db.commit()
+		self.writes += 1
+		if self.writes % self.evict_every == 0:
+			self.evict()
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Get cached page or None.
+	# Result: dict(html, text, etag, last_modified, fresh)
+	# ------------------------------------------------------------------
+	def get(self, url):
+		now    = int(time.time())
+		oldest = now - self.ttl if self.ttl else 0
+		result = None
+
+		row = self.db.execute(
+			'SELECT html, text, etag, last_modified, fetched FROM web_page_cache WHERE url = ? AND fetched >= ?',
+			(url, oldest)
+		).fetchone()
+
+		if row is not None:
+			html, text, etag, last_modified, fetched = row
+			result = {
+				'html'          : self._unpack(html),
+				'text'          : self._unpack(text),
+				'etag'          : etag,
+				'last_modified' : last_modified,
+				'fresh'         : now - fetched < self.fresh_for,
+			}
+			self.db.execute('UPDATE web_page_cache SET accessed = ? WHERE url = ?', (now, url))
+			self.db.commit()
+
+		return result
+
+	# Store downloaded page, drops previously extracted text
+	# ------------------------------------------------------------------
+	def set(self, url, html, etag=None, last_modified=None):
+		now  = int(time.time())
+		html = self._pack(html)
+
+		self.db.execute(
+			'INSERT OR REPLACE INTO web_page_cache '
+			'(url, html, text, etag, last_modified, size, fetched, accessed) VALUES (?, ?, NULL, ?, ?, ?, ?, ?)',
+			(url, html, etag, last_modified, len(html), now, now)
+		)
+		self._written()
+
+	# Store extracted text of cached page
+	# ------------------------------------------------------------------
+	def set_text(self, url, text):
+		text = self._pack(text)
+
+		self.db.execute(
+			'UPDATE web_page_cache SET text = ?, size = length(html) + ? WHERE url = ?',
+			(text, len(text or b''), url)
+		)
+		self._written()
+
+	# Mark page as revalidated (304 Not Modified)
+	# ------------------------------------------------------------------
+	def touch(self, url):
+		now = int(time.time())
+
+		self.db.execute(
+			'UPDATE web_page_cache SET fetched = ?, accessed = ? WHERE url = ?',
+			(now, now, url)
+		)
+		self.db.commit()
+
+	# Count lookup outcome: 'hit', 'revalidated' or 'miss'
+	# ------------------------------------------------------------------
+	def count(self, outcome):
+		if   outcome == 'hit'         : self.hits        += 1
+		elif outcome == 'revalidated' : self.revalidated += 1
+		else                          : self.misses      += 1
+
+	# Drop expired entries, then least recently used above max size
+	# ------------------------------------------------------------------
+	def evict(self):
+		if self.ttl:
+			self.db.execute(
+				'DELETE FROM web_page_cache WHERE fetched < ?',
+				(int(time.time()) - self.ttl,)
+			)
+
+		self.db.execute('''
+			DELETE FROM web_page_cache WHERE url IN (
+				SELECT url FROM (
+					SELECT url, SUM(size) OVER (ORDER BY accessed DESC, url) AS total
+					FROM web_page_cache
+				) WHERE total > ?
+			)
+		''', (self.max_bytes,))
+		self.db.commit()
+
+	# Drop all entries
+	# ------------------------------------------------------------------
+	def clear(self):
+		self.db.execute('DELETE FROM web_page_cache')
+		self.db.commit()
+
+	# Hit-rate statistics
+	# ------------------------------------------------------------------
+	def stats(self):
+		total         = self.hits + self.revalidated + self.misses
+		entries, size = self.db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM web_page_cache').fetchone()
+
+		result = {
+			'hits'        : self.hits,
+			'revalidated' : self.revalidated,
+			'misses'      : self.misses,
+			'hit_rate'    : (self.hits + self.revalidated) / total if total else 0.0,
+			'entries'     : entries,
+			'bytes'       : size,
+		}
+		return result
@@ -2,7 +2,9 @@
 # Rag service coordinating semantic DB and vector DB.
 # ======================================================================
 
-from collections import defaultdict
+import time, threading
+from difflib     import SequenceMatcher
+from collections import defaultdict, OrderedDict
 
 import ww, yo, o
 
@@ -10,43 +12,62 @@ import ww, yo, o
 
 class Rag(ww.Service):
 
+	embedding_cache_size = 1024                         # Max cached query embeddings
+	result_cache_size    = 256                          # Max cached search results
+	karma                = 0.3                          # Neighbor context weight when encoding atoms
+	context              = 2                            # Neighbor sentences encoded around partial runs
+	encoder_id           = None                         # Encoder model id keying embedding cache, defaults to Encoder.model_name
+
 	# To initialize vector database and hydrate it from persistent atoms.
 	# ------------------------------------------------------------------
 	def initialize(self):
-		self.vdb = yo.models.VectorDb(yo.models.Encoder.dim)
+		self.vdb        = yo.models.VectorDb(yo.models.Encoder.dim)
+		self.embeddings = OrderedDict()                 # normalized query → vector
+		self.results    = OrderedDict()                 # (domain, query, top_k, version) → hits
+		self.versions   = defaultdict(int)              # domain id → version
+		self.stats      = defaultdict(int)              # cache hit / miss counters
+		self.encoding   = threading.Lock()              # Shared encoder, one call at a time
 		self._hydrate()
 
 	# ==================================================================
 	# PRIVATE METHODS
 	# ==================================================================
 
-	# Restore persistent semantic atoms into vector DB.
-	# Remove all temporary domains from database.
+	# Restore semantic atoms of all domains into vector DB.
+	# Temporary domains are kept, their eviction is up to owner service.
+	# Vectors come from snapshot when fresh, from atoms otherwise.
 	# ------------------------------------------------------------------
 	def _hydrate(self):
 		self.print('Hydrating Vector Database ... ', end='', flush=True)
 		ww.Timer.start('hydration')
-		# Drop all temporary domains (DB only)
-		# - - - - - - - - - - - - - - - - - - - -
-		for domain in o.T.SemanticDomain.get_all(temporary=True):
-			domain.remove()
 
-		# Load persistent domains into VDB
+		snapshot = ww.services.VectorSnapshot.load(yo.models.Encoder.dim)
+		dirty    = snapshot is None
+		domains  = {}
+
+		# Load domains into VDB
 		# - - - - - - - - - - - - - - - - - - - -
-		for domain in o.T.SemanticDomain.get_all(temporary=False):
+		for domain in o.T.SemanticDomain.get_all():
 			self.vdb.add_domain(domain.id)
+
+			entries   = (snapshot or {}).pop(domain.id, {})
+			documents = domains.setdefault(domain.id, [])
+
 			for document in domain.get_documents():
+				entry = entries.pop(document.id, None)
 
-				vector_ids    = []
-				vector_values = []
+				if entry is not None and ww.services.VectorSnapshot.is_fresh(entry, document):
+					vector_ids, vectors = entry[2], entry[3]
+				else:
+					vector_ids, vectors = self._replay(document)
+					dirty = True
 
-				for atom in document.get_atoms():
-					vector_ids.append(atom.id)
-					vector_values.append(atom.vector)
+					if document.created is None:                 # Saved before creation was stamped
+						document.created = int(time.time())
+						document.save()
 
-				if vector_ids:
-					vectors         = yo.T.stack(vector_values)
-					document_offset = min(vector_ids)
+				if len(vector_ids):
+					document_offset = int(min(vector_ids))
 
 					self.vdb.add_document(
 						domain.id,
@@ -54,14 +75,84 @@ class Rag(ww.Service):
 						document_offset,
 						vectors
 					)
+					documents.append((document.id, document.created, document.mtime, vector_ids, vectors))
+
+			dirty = dirty or bool(entries)                   # Documents removed since snapshot
+
+		dirty = dirty or bool(snapshot)                      # Domains removed since snapshot
+
+		if dirty:
+			ww.services.VectorSnapshot.save_in_background(yo.models.Encoder.dim, domains)
+
 		print(ww.Timer.stop('hydration').get_time(), 's', sep='')
 
-	# Split full document text into atom texts and vectors.
+	# Read document atom ids and vectors from database.
 	# ------------------------------------------------------------------
-	def _vectorize(self, text: str):
-		texts   = yo.parsers.Pysbd(text)
-		vectors = yo.models.Encoder.encode_sequence_batch(texts, karma=0.3, with_attentions=False)
-		return texts, vectors
+	def _replay(self, document):
+		vector_ids    = []
+		vector_values = []
+
+		for atom in document.get_atoms():
+			vector_ids.append(atom.id)
+			vector_values.append(atom.vector)
+
+		vectors = yo.T.stack(vector_values) if vector_values else None
+		return vector_ids, vectors
+
+	# Get value from LRU cache, count hit or miss
+	# ------------------------------------------------------------------
+	def _cache_get(self, cache, name, key):
+		value = cache.get(key)
+
+		if value is None:
+			self.stats[f'{name}_misses'] += 1
+		else:
+			self.stats[f'{name}_hits'] += 1
+			cache.move_to_end(key)
+
+		return value
+
+	# Put value into LRU cache, evict least recently used
+	# ------------------------------------------------------------------
+	def _cache_put(self, cache, key, value, size):
+		cache[key] = value
+		cache.move_to_end(key)
+
+		while len(cache) > size:
+			cache.popitem(last=False)
+
+		return value
+
+	# Bump domain version and drop its cached results
+	# ------------------------------------------------------------------
+	def _invalidate(self, domain_id):
+		self.versions[domain_id] += 1
+
+		for key in [key for key in self.results if key[0] == domain_id]:
+			del self.results[key]
+
+	# Call shared encoder, one thread at a time: its tokenizer is not
+	# safe for concurrent use and parallel inference does not scale.
+	# ------------------------------------------------------------------
+	def _encode_locked(self, encode, *args, **kwargs):
+		with self.encoding:
+			return encode(*args, **kwargs)
+
+	# Encode query, reuse embedding of same normalized text
+	# ------------------------------------------------------------------
+	def _encode_query(self, query):
+		query  = ' '.join(query.split())
+		vector = self._cache_get(self.embeddings, 'embedding', query)
+
+		if vector is None:
+			vector = self._cache_put(
+				self.embeddings,
+				query,
+				self._encode_locked(yo.models.Encoder.encode, query),
+				self.embedding_cache_size
+			)
+
+		return vector
 
 	# Rerank results from vdb
 	# ------------------------------------------------------------------
@@ -99,31 +190,134 @@ class Rag(ww.Service):
 		if domain is not None:
 			domain.remove()
 			self.vdb.remove_domain(domain.id)
+			self._invalidate(domain.id)
 			return False
 
 		return True
 
+	# Split full document text into atom texts and vectors.
+	# Used by workers ahead of DB writes: splitting runs in parallel,
+	# encoder calls are serialized.
+	# ------------------------------------------------------------------
+	def vectorize(self, text: str):
+		texts   = yo.parsers.Pysbd(text)
+		vectors = self.encode(texts)
+		return texts, vectors
+
+	# Encode atom texts into vectors.
+	# ------------------------------------------------------------------
+	def encode(self, texts):
+		if not texts:
+			return self._encode_locked(yo.models.Encoder.encode_sequence_batch, texts, karma=self.karma, with_attentions=False)
+
+		rows = self.encode_at(texts, range(len(texts)))
+		return yo.T.stack([rows[j] for j in range(len(texts))])
+
+	# Encode only `positions` of sentence sequence. Repeated sentences are
+	# served from persistent embedding cache, misses are encoded in their
+	# own positions. Returns { position: vector }.
+	# ------------------------------------------------------------------
+	def encode_at(self, texts, positions):
+		encoder_id = self.encoder_id or getattr(yo.models.Encoder, 'model_name', None)
+
+		if encoder_id is None:
+			if not self.stats['encoder_id_missing']:
+				self.print('‼️ Encoder has no model id, set `Rag.encoder_id` to enable embedding cache')
+			self.stats['encoder_id_missing'] += 1
+			return self._encode_windows(texts, positions)
+
+		result = ww.services.EmbeddingCache.encode(
+			texts,
+			positions,
+			self._encode_windows,
+			identity = f'{encoder_id}:karma={self.karma}:context={self.context}',
+			dim      = yo.models.Encoder.dim
+		)
+		return result
+
+	# Encode positions, each run together with `context` real neighbors
+	# on both sides so karma blending sees the same context as full
+	# encoding. Returns { position: vector }.
+	# ------------------------------------------------------------------
+	def _encode_windows(self, texts, positions):
+		result  = {}
+		windows = []
+
+		for j in sorted(set(positions)):
+			lo, hi = max(j - self.context, 0), min(j + self.context + 1, len(texts))
+
+			if windows and lo <= windows[-1][1]:        # Overlapping windows are merged
+				windows[-1][1] = hi
+				windows[-1][2].append(j)
+			else:
+				windows.append([lo, hi, [j]])
+
+		for lo, hi, run in windows:
+			vectors = self._encode_locked(yo.models.Encoder.encode_sequence_batch, texts[lo:hi], karma=self.karma, with_attentions=False)
+			for j in run:
+				result[j] = vectors[j - lo]
+
+		return result
+
+	# Stored atom texts and vectors of document, in sentence order
+	# ------------------------------------------------------------------
+	def get_atoms(self, document):
+		atoms = sorted(document.get_atoms(), key=lambda atom: atom.item_id)
+		return [atom.text for atom in atoms], [atom.vector for atom in atoms]
+
+	# Diff new text against stored sentences, reuse vectors of unchanged
+	# ones and encode inserted / edited runs in context.
+	# No DB access, used by workers ahead of update_document: diffing runs
+	# in parallel, encoder calls are serialized.
+	# Returns (texts, vectors, sources): sources[j] is index of reused
+	# stored sentence or None when encoded.
+	# ------------------------------------------------------------------
+	def reencode(self, old_texts, old_vectors, text):
+		texts   = yo.parsers.Pysbd(text)
+		vectors = [None] * len(texts)
+		sources = [None] * len(texts)
+		matcher = SequenceMatcher(None, old_texts, texts, autojunk=False)
+
+		for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+			if tag == 'equal':
+				for k in range(j2 - j1):
+					vectors[j1 + k] = old_vectors[i1 + k]
+					sources[j1 + k] = i1 + k
+
+		changed = [j for j, source in enumerate(sources) if source is None]
+
+		for j, vector in self.encode_at(texts, changed).items():
+			vectors[j] = vector
+
+		return texts, vectors, sources
+
 	# Create or update document and fully reindex its atoms from full text.
 	# Strategy: remove and re-insert (DB), range-remove (VDB).
+	# Pass `atoms` = (texts, vectors) when already vectorized.
 	# ------------------------------------------------------------------
-	def add_document(self, domain_id, document_key, text, mtime, description=''):
-		ww.Timer.start('vectorize')
-		texts, vectors = self._vectorize(text)
-		ww.Timer.stop('vectorize', report=True)
+	def add_document(self, domain_id, document_key, text, mtime, description='', digest=None, atoms=None):
+		if atoms is None:
+			ww.Timer.start('vectorize')
+			atoms = self.vectorize(text)
+			ww.Timer.stop('vectorize', report=True)
+
+		texts, vectors = atoms
 		domain         = o.T.SemanticDomain.load(domain_id)
-		
+
 		document = o.T.SemanticDocument(
 			key         = document_key,
 			domain      = domain,
 			mtime       = mtime,
-			description = description
+			description = description,
+			digest      = digest
 		).save()
 
 		ww.Timer.start('add_atoms')
 		o.Db.tx_begin()
 		vector_ids      = document.add_atoms(texts, vectors)
 		o.Db.tx_end()
-		ww.Timer.stop('add_atoms', report=True)
+		elapsed         = ww.Timer.stop('add_atoms', report=True).get_time()
+		self.print(f'Added {len(vector_ids)} atoms ({len(vector_ids) / max(elapsed, 1e-6):.0f} rows/s)')
 		document_offset = min(vector_ids)
 
 		self.vdb.add_document(
@@ -132,6 +326,84 @@ class Rag(ww.Service):
 			document_offset,
 			vectors
 		)
+		self._invalidate(domain_id)
+		return document
+
+	# Update document incrementally: diff new sentences against stored atoms,
+	# reuse vectors of unchanged sentences, encode only inserted / edited ones.
+	# DB rows are patched by position, VDB block is replaced without re-embedding.
+	# Pass `atoms` = reencode(...) result when already encoded.
+	# ------------------------------------------------------------------
+	def update_document(self, domain_id, document_key, text, mtime, description=None, digest=None, atoms=None):
+		domain   = o.T.SemanticDomain.load(domain_id)
+		document = domain.get_document(document_key) if domain is not None else None
+
+		if document is None:
+			return self.add_document(domain_id, document_key, text, mtime, description or '', digest)
+
+		stored = sorted(document.get_atoms(), key=lambda atom: atom.item_id)
+
+		if atoms is None:
+			ww.Timer.start('vectorize')
+			atoms = self.reencode([atom.text for atom in stored], [atom.vector for atom in stored], text)
+			ww.Timer.stop('vectorize', report=True)
+
+		texts, vectors, sources = atoms
+		changed                 = sum(source is None for source in sources)
+		atoms                   = stored
+
+		# Patch DB rows by position, rows keeping their own sentence stay.
+		# VDB addresses a document by offset of its first atom, so its atom
+		# ids must stay contiguous: a grown document is re-inserted as one
+		# block instead, reusing vectors so nothing is re-embedded.
+		# - - - - - - - - - - - - - - - - - - - -
+		o.Db.tx_begin()
+		patched = 0
+
+		if len(texts) > len(atoms):
+			for atom in atoms:
+				atom.remove()
+
+			vector_ids = document.add_atoms(texts, vectors)
+			patched    = len(vector_ids)
+		else:
+			for item_id, atom in enumerate(atoms[:len(texts)]):
+				if sources[item_id] != item_id:
+					atom.text   = texts[item_id]
+					atom.vector = vectors[item_id]
+					atom.save()
+					patched += 1
+
+			for atom in atoms[len(texts):]:
+				atom.remove()
+
+			vector_ids = [atom.id for atom in atoms[:len(texts)]]
+
+		document.mtime  = mtime
+		document.digest = digest
+		if description is not None:
+			document.description = description
+		document.save()
+		o.Db.tx_end()
+
+		self.print(
+			f'Updated `{document_key}`: {changed}/{len(texts)} sentences encoded, '
+			f'{patched} rows written'
+		)
+
+		# Replace VDB block with reused + fresh vectors
+		# - - - - - - - - - - - - - - - - - - - -
+		self.vdb.remove_document(domain_id, document.id)
+
+		if texts:
+			self.vdb.add_document(
+				domain_id,
+				document.id,
+				min(vector_ids),
+				yo.T.stack(vectors)
+			)
+
+		self._invalidate(domain_id)
 		return document
 
 	# Remove document and all its atoms (DB + VDB)
@@ -142,6 +414,7 @@ class Rag(ww.Service):
 		if document is not None:
 			self.vdb.remove_document(domain_id, document_id)
 			document.remove()
+			self._invalidate(domain_id)
 			return True
 
 		return False
@@ -152,48 +425,61 @@ class Rag(ww.Service):
 		domain = o.T.SemanticDomain.load(domain_id)
 		return domain.get_documents() if domain is not None else []
 
+	# Hit / miss counters of query embedding and result caches
+	# ------------------------------------------------------------------
+	def cache_stats(self):
+		return dict(self.stats)
+
 	# Search
+	# Hits are materialized with one atom query per hit document.
 	# ------------------------------------------------------------------
 	def search(self, domain_id_or_key, query, top_k):
 		ww.Timer.start('search')
-		
+
 		domain  = o.T.SemanticDomain.load(domain_id_or_key)
 		results = []
-
-		self.print(f'Searching`{domain.key}` for `{query}` ... ', end='', flush=True)
+		d       = defaultdict(list)
+		key     = None
 
 		if domain is not None:
-			query_vector = yo.models.Encoder.encode(query)
+			key    = (domain.id, ' '.join(query.split()), top_k, self.versions[domain.id])
+			cached = self._cache_get(self.results, 'result', key)
+
+			if cached is not None:
+				print(ww.Timer.stop('search').get_time(), 's', sep='')
+				return {k: list(v) for k, v in cached.items()}
+
+			self.print(f'Searching`{domain.key}` for `{query}` ... ', end='', flush=True)
+
+			query_vector = self._encode_query(query)
 			doc_scores   = self.vdb.query(query_vector, domain.id, k = top_k)
 
 			for document_id, atoms in doc_scores.items():
-				document = o.T.SemanticDocument.load(document_id)
+				document = o.T.SemanticDocument.load(int(document_id))
+				texts    = document.get_texts(atoms) if document is not None else {}
 
 				for atom_id, score in atoms.items():
-					atom = o.T.SemanticAtom.load(atom_id)
-
-					results.append({
-						'domain'   : domain,
-						'document' : document,
-						'atom'     : atom,
-						'text'     : atom.text,
-						'score'    : score,
-					})
-					
+					text = texts.get(int(atom_id))
+
+					if text is not None:
+						results.append({
+							'atom_id'      : int(atom_id),
+							'document_key' : document.key,
+							'text'         : text,
+							'score'        : score,
+						})
+
 			min_score = 0.5
 			results = self._rerank(query, results, min_score, top_k)
 
-			d = defaultdict(list)
 			for result in results:
-				item = (result['atom'].id, result['score'], result['text'])
-				d[result['document'].key].append(item)
+				item = (result['atom_id'], result['score'], result['text'])
+				d[result['document_key']].append(item)
+
+			for document_key in d:
+				d[document_key].sort(key=lambda x: x[0])
 
-			for key in d:
-				d[key].sort(key=lambda x: x[0])
+			self._cache_put(self.results, key, {k: list(v) for k, v in d.items()}, self.result_cache_size)
 
 		print(ww.Timer.stop('search').get_time(), 's', sep='')
 		return d
-
-
-
-	
\ No newline at end of file
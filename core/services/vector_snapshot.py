@@ -0,0 +1,162 @@
+# ======================================================================
+# VectorSnapshot — versioned on-disk copy of vector database.
+# Per domain: float32 matrix + Sid array (.npy), loaded memory-mapped.
+# ======================================================================
+
+import os, json, time, shutil, threading
+
+import numpy as np
+import torch
+
+import ww
+
+
+class VectorSnapshot(ww.Service):
+
+	version = 1                                         # On-disk layout version
+	path    = None                                      # Snapshot dir, defaults next to DB
+
+	# ------------------------------------------------------------------
+	def initialize(self):
+		self.path   = VectorSnapshot.path or os.path.splitext(ww.Conf.DB_PATH)[0] + '.vdb'
+		self.lock   = threading.Lock()                  # One writer at a time
+		self.thread = None
+
+	# ==================================================================
+	# PRIVATE METHODS
+	# ==================================================================
+
+	# Path of file inside snapshot directory
+	# ------------------------------------------------------------------
+	def _file(self, name, root=None):
+		return os.path.join(root or self.path, name)
+
+	# Convert tensor or memmap slice to contiguous float32 array
+	# ------------------------------------------------------------------
+	def _to_numpy(self, vectors):
+		if isinstance(vectors, torch.Tensor):
+			vectors = vectors.detach().to(torch.float32).cpu().numpy()
+		return np.asarray(vectors, dtype=np.float32)
+
+	# Write snapshot files to tmp dir, then swap it in
+	# ------------------------------------------------------------------
+	def _save(self, dim, domains):
+		watermark = int(time.time())
+		tmp_path  = self.path + '.tmp'
+		manifest  = {
+			'version'   : self.version,
+			'dim'       : dim,
+			'watermark' : watermark,
+			'domains'   : {}
+		}
+
+		shutil.rmtree(tmp_path, ignore_errors=True)
+		os.makedirs(tmp_path)
+
+		for domain_id, documents in domains.items():
+			entries = []
+			start   = 0
+
+			for document_id, created, mtime, ids, vectors in documents:
+				end = start + len(ids)
+				entries.append([document_id, created, mtime, start, end])
+				start = end
+
+			if documents:
+				ids     = np.concatenate([np.asarray(ids, dtype=np.int64) for *_, ids, _ in documents])
+				vectors = np.concatenate([self._to_numpy(vectors) for *_, vectors in documents])
+			else:
+				ids     = np.empty(0, dtype=np.int64)
+				vectors = np.empty((0, dim), dtype=np.float32)
+
+			np.save(self._file(f'{domain_id}.ids.npy',     tmp_path), ids)
+			np.save(self._file(f'{domain_id}.vectors.npy', tmp_path), vectors)
+			manifest['domains'][str(domain_id)] = entries
+
+		with open(self._file('manifest.json', tmp_path), 'w') as f:
+			json.dump(manifest, f)
+
+		shutil.rmtree(self.path, ignore_errors=True)
+		os.replace(tmp_path, self.path)
+
+		self.watermark = watermark
+		return watermark
+
+	# ==================================================================
+	# PUBLIC METHODS
+	# ==================================================================
+
+	# Load snapshot or return None if missing / stale.
+	# Result: { domain_id: { document_id: (created, mtime, ids, vectors) } }
+	# Vectors are zero-copy views into memory-mapped matrix.
+	# ------------------------------------------------------------------
+	def load(self, dim):
+		result = None
+
+		try:
+			with open(self._file('manifest.json')) as f:
+				manifest = json.load(f)
+
+			if manifest['version'] == self.version and manifest['dim'] == dim:
+				result = {}
+
+				for domain_id, documents in manifest['domains'].items():
+					ids     = np.load(self._file(f'{domain_id}.ids.npy'),     mmap_mode='c')
+					vectors = np.load(self._file(f'{domain_id}.vectors.npy'), mmap_mode='c')
+					entries = {}
+
+					for document_id, created, mtime, start, end in documents:
+						entries[document_id] = (
+							created,
+							mtime,
+							ids[start:end],
+							torch.from_numpy(vectors[start:end])
+						)
+
+					result[int(domain_id)] = entries
+
+				self.watermark = manifest['watermark']
+
+		except FileNotFoundError:
+			result = None
+
+		except Exception as e:
+			self.print(f'‼️ Snapshot `{self.path}` is unreadable, rebuilding: {e}')
+			result = None
+
+		return result
+
+	# Is snapshot entry still valid for given document?
+	# Documents without creation time can not be told apart from
+	# re-created ones with reused id, so they are never fresh.
+	# ------------------------------------------------------------------
+	def is_fresh(self, entry, document):
+		created, mtime = entry[0], entry[1]
+
+		result = (
+			document.created is not None and
+			created == document.created  and
+			mtime   == document.mtime    and
+			max(document.created, document.mtime or 0) < self.watermark
+		)
+		return result
+
+	# Write snapshot atomically.
+	# domains: { domain_id: [(document_id, created, mtime, ids, vectors), ...] }
+	# ------------------------------------------------------------------
+	def save(self, dim, domains):
+		with self.lock:
+			return self._save(dim, domains)
+
+	# Write snapshot in background thread, returns the thread.
+	# Caller must not mutate `domains` afterwards.
+	# ------------------------------------------------------------------
+	def save_in_background(self, dim, domains):
+		self.thread = threading.Thread(
+			target = self.save,
+			args   = (dim, domains),
+			name   = 'vector-snapshot',
+			daemon = True                               # Torn write leaves only tmp dir
+		)
+		self.thread.start()
+		return self.thread
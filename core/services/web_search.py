@@ -2,51 +2,222 @@
 # WebSearch
 # ======================================================================
 
+import time, asyncio, hashlib
+
 import ww, o
 
 
 class WebSearch(ww.Service):
 
+	embed_workers = 2                                   # Pages split in parallel, encoding serialized by Rag
+	queue_size    = 4                                   # Pages waiting between stages
+	ttl           = 7 * 24 * 3600                       # Unused query domain lifetime, seconds, None = forever
+	max_atoms     = 500000                              # Atom budget of all query domains, LRU above
+	evict_every   = 300                                 # Seconds between background eviction passes
+
 	def initialize(self):
 		self.rag     = ww.services.Rag
 		self.google  = ww.services.Google
 		self.website = ww.services.WebSite
+		self.active  = set()                            # ids of domains being ingested
+		self.evictor = None
 
+	# ======================================================================
+	# PRIVATE METHODS
+	# ======================================================================
+
+	# Encode extracted pages off the event loop. Workers overlap sentence
+	# splitting only, Rag runs one encoder call at a time.
 	# ----------------------------------------------------------------------
-	def get_domain_id(self, query):
-		return f'web_{abs(hash(query))}'
+	async def _embed_worker(self, queue, out, timings):
+		while (doc := await queue.get()) is not None:
+			try:
+				with self.website.timed('embed', doc.name, timings):
+					atoms = await asyncio.to_thread(self.rag.vectorize, doc.text)
+			except Exception as e:
+				doc.error = f'{type(e).__name__}: {e}'
+				self.print(f'‼️ Could not embed `{doc.name}`: {doc.error}')
+			else:
+				await out.put((doc, atoms))             # Blocks while indexing lags
 
+	# Fetch → extract → embed stages, embedded pages go to `out`
 	# ----------------------------------------------------------------------
-	async def search(self, query, k_results=5, k_chunks=10):
+	async def _embed(self, docs, out, timings):
+		queue   = asyncio.Queue(maxsize=self.queue_size)
+		pages   = self.website.stream(docs, timings=timings)
+		workers = [
+			asyncio.create_task(self._embed_worker(queue, out, timings))
+			for _ in range(self.embed_workers)
+		]
 
-		domain_key = self.get_domain_id(query)
+		try:
+			async for doc in pages:
+				if doc.text:
+					await queue.put(doc)                  # Blocks while embedding lags
+			for _ in workers:
+				await queue.put(None)
+			await asyncio.gather(*workers)
+			await out.put(None)
+		except BaseException:
+			for task in workers:
+				task.cancel()
+			if out.full():
+				out.get_nowait()                        # Room for end marker, dropped page is resumed later
+			out.put_nowait(None)
+			raise
+		finally:
+			for task in workers:
+				task.cancel()
+			await pages.aclose()
+
+	# Ingest pages into domain as overlapping stages: page N+1 downloads
+	# while page N is extracted and page N-1 is embedded. Indexing runs
+	# here, on the loop thread, and yields each page once searchable.
+	# ----------------------------------------------------------------------
+	async def _ingest(self, domain, docs):
+		timings = {}
+		out     = asyncio.Queue(maxsize=self.queue_size)
+		feeder  = asyncio.create_task(self._embed(docs, out, timings))
+		count   = 0
+
+		self.active.add(domain.id)
+		ww.Timer.start(f'ingest:{domain.key}')
+		try:
+			while (item := await out.get()) is not None:
+				doc, atoms = item
+				domain.atoms += len(atoms[0])
+
+				with self.website.timed('index', doc.name, timings):
+					self.rag.add_document(
+						domain_id    = domain.id,
+						document_key = doc.name,
+						text         = doc.text,
+						mtime        = doc.mtime,
+						description  = doc.title,
+						atoms        = atoms
+					)
+				count += 1
+				yield doc
+
+			await feeder
+			domain.complete = True                   # Not reached when consumer stopped early
+
+		finally:
+			feeder.cancel()
+			domain.save()
+			self.active.discard(domain.id)
+			elapsed = ww.Timer.stop(f'ingest:{domain.key}').get_time()
+			stages  = ', '.join(f'{stage} {seconds:.2f}s' for stage, seconds in timings.items())
+			self.print(f'Ingested {count} pages in {elapsed:.2f}s ({stages})')
+
+	# Load or create temporary domain for query and mark it used.
+	# Pages are discovered when domain is new, or when its ingestion was
+	# stopped early: then only pages not indexed yet are resumed.
+	# Returns (domain, domain key, pages to ingest or None).
+	# ----------------------------------------------------------------------
+	async def _discover(self, query, k_results):
+		self._start_evictor()
 
-		# 1. Ingest only if domain does not exist
-		if not self.rag.has_domain(domain_key):
+		domain_key = self.get_domain_id(query)
+		domain     = o.T.SemanticDomain.load(domain_key)
+		docs       = None
 
+		if domain is None:
 			domain = self.rag.add_domain(
 				key         = domain_key,
 				temporary   = True,
 				description = query
 			)
 
-			docs = self.google.search(
-				query      = query,
-				time_range = (None, None),
-				top_k      = k_results
-			)
+		if not domain.complete and domain.id not in self.active:
+			self.active.add(domain.id)               # Claimed here, released by _ingest
+			try:
+				docs = await self.google.search(
+					query      = query,
+					time_range = (None, None),
+					top_k      = k_results
+				)
+			except BaseException:
+				self.active.discard(domain.id)
+				raise
 
-			docs = await self.website.load(docs)
+			known = {document.key for document in domain.get_documents()}
+			if known:
+				docs = [doc for doc in docs if doc.name not in known]
+				self.print(f'Resuming `{query}`: {len(known)} pages indexed, {len(docs)} left')
 
-			for doc in docs:
-				if doc and doc.text:
-					self.rag.add_document(
-						domain_id    = domain.id,
-						document_key = doc.name,
-						text         = doc.text,
-						mtime        = doc.mtime,
-						description  = doc.title
-					)
+		domain.accessed = int(time.time())
+		domain.save()
+
+		return domain, domain_key, docs
+
+	# Run eviction periodically while event loop is alive
+	# ----------------------------------------------------------------------
+	async def _evict_loop(self):
+		while True:
+			try:
+				self.evict()
+			except Exception as e:
+				self.print(f'‼️ Eviction failed: {type(e).__name__}: {e}')
+			await asyncio.sleep(self.evict_every)
+
+	# Start background eviction on current loop once
+	# ----------------------------------------------------------------------
+	def _start_evictor(self):
+		loop = asyncio.get_running_loop()
+
+		if self.evictor is None or self.evictor.done() or self.evictor.get_loop() is not loop:
+			self.evictor = loop.create_task(self._evict_loop())
+
+	# Number of chunks in search results scoring at least `min_score`
+	# ----------------------------------------------------------------------
+	def _count_above(self, results, min_score):
+		return sum(score >= min_score for chunks in results.values() for _, score, _ in chunks)
+
+	# ======================================================================
+	# PUBLIC METHODS
+	# ======================================================================
+
+	# Stable domain key: hash of normalized query, same across restarts
+	# ----------------------------------------------------------------------
+	def get_domain_id(self, query):
+		query = ' '.join(query.lower().split())
+		return f'web_{hashlib.sha256(query.encode("utf-8")).hexdigest()}'
+
+	# Drop query domains unused for `ttl`, then least recently used
+	# ones until all fit into `max_atoms`. Domains being ingested stay.
+	# ----------------------------------------------------------------------
+	def evict(self):
+		now     = int(time.time())
+		domains = sorted(
+			[domain for domain in o.T.SemanticDomain.get_all(temporary=True) if domain.id not in self.active],
+			key = lambda domain: domain.accessed or domain.created or 0
+		)
+		total   = sum(domain.atoms or 0 for domain in domains)
+		removed = 0
+
+		for domain in domains:
+			expired = self.ttl and (domain.accessed or domain.created or 0) < now - self.ttl
+
+			if expired or total > self.max_atoms:
+				total -= domain.atoms or 0
+				self.rag.remove_domain(domain.id)
+				removed += 1
+
+		if removed:
+			self.print(f'Evicted {removed} query domains, {total} atoms left')
+
+		return removed
+
+	# ----------------------------------------------------------------------
+	async def search(self, query, k_results=5, k_chunks=10):
+
+		# 1. Ingest if domain is new or was left partial
+		domain, domain_key, docs = await self._discover(query, k_results)
+
+		if docs is not None:
+			async for _ in self._ingest(domain, docs):
+				pass
 
 		# 2. Search
 		return self.rag.search(
@@ -54,3 +225,43 @@ class WebSearch(ww.Service):
 			query            = query,
 			top_k            = k_chunks
 		)
+
+	# Early-answer search: yield ranked chunks once `first_k` pages are
+	# searchable, then refined results after every further page.
+	# With `min_score`, ingestion stops as soon as `enough` chunks
+	# (default `k_chunks`) score at least `min_score`.
+	# ----------------------------------------------------------------------
+	async def search_stream(self, query, k_results=5, k_chunks=10, first_k=1, min_score=None, enough=None):
+		domain, domain_key, docs = await self._discover(query, k_results)
+		enough  = enough or k_chunks
+		results = None
+		count   = 0
+
+		if docs is not None:
+			pages = self._ingest(domain, docs)
+
+			try:
+				async for _ in pages:
+					count += 1
+
+					if count >= first_k:
+						results = self.rag.search(
+							domain_id_or_key = domain_key,
+							query            = query,
+							top_k            = k_chunks
+						)
+						yield results
+
+						if min_score is not None and self._count_above(results, min_score) >= enough:
+							self.print(f'Enough chunks above {min_score} after {count} pages, stopping')
+							break
+			finally:
+				await pages.aclose()
+
+		# Already indexed, or fewer pages than `first_k` got through
+		if results is None:
+			yield self.rag.search(
+				domain_id_or_key = domain_key,
+				query            = query,
+				top_k            = k_chunks
+			)
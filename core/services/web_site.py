@@ -2,61 +2,259 @@
 # WebSite — load HTML and extract readable text.
 # ======================================================================
 
+import os, pickle, asyncio
+from contextlib         import contextmanager
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+
 import aiohttp
 import trafilatura
 
 import ww, o
 
 
+# Extract readable text from html (runs in worker process)
+# ----------------------------------------------------------------------
+def _extract(html):
+	text = None
+
+	if html:
+		text = trafilatura.extract(
+			html,
+			include_comments = False,
+			include_tables   = False
+		)
+
+	return text
+
+
 class WebSite(ww.Service):
 
-	timeout    = 20
-	user_agent = 'WordWield-WebSite/1.0'
+	timeout     = 20
+	user_agent  = 'WordWield-WebSite/1.0'
+	concurrency = 10                                    # Max pages in flight
+	per_host    = 4                                     # Max connections per host
+	dns_ttl     = 300                                   # DNS cache ttl, seconds
+	workers     = os.cpu_count() or 1                   # Extraction processes, 0 = in-thread
+	queue_size  = 32                                    # Pages waiting for extraction
+	cache       = True                                  # Use persistent PageCache
 
 	# ------------------------------------------------------------------
 	def initialize(self):
-		self.timeout    = WebSite.timeout
-		self.user_agent = WebSite.user_agent
+		self.timeout     = WebSite.timeout
+		self.user_agent  = WebSite.user_agent
+		self.concurrency = WebSite.concurrency
+		self.per_host    = WebSite.per_host
+		self.workers     = WebSite.workers
+		self.queue_size  = WebSite.queue_size
+		self.cache       = WebSite.cache
+		self.session     = None
+		self.loop        = None
+		self.pool        = None
 
 	# ------------------------------------------------------------------
-	async def request(self, url):
-		headers = {'User-Agent': self.user_agent}
-		timeout = aiohttp.ClientTimeout(total=self.timeout)
-		text    = None
+	def _get_session(self):
+		loop = asyncio.get_running_loop()
 
-		async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
-			async with session.get(url) as resp:
-				if resp.status >= 400:
-					resp.raise_for_status()
-				text = await resp.text(errors='ignore')
+		if self.session is None or self.session.closed or self.loop is not loop:
+			connector = aiohttp.TCPConnector(
+				limit          = self.concurrency,
+				limit_per_host = self.per_host,
+				ttl_dns_cache  = self.dns_ttl,
+			)
+			self.session = aiohttp.ClientSession(
+				headers   = {'User-Agent': self.user_agent},
+				timeout   = aiohttp.ClientTimeout(total=self.timeout),
+				connector = connector,
+			)
+			self.loop = loop
 
-		return text
+		return self.session
+
+	# ------------------------------------------------------------------
+	def _get_pool(self):
+		if self.pool is None and self.workers > 0:
+			self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+		return self.pool
+
+	# Fall back to in-thread extraction for good, once per broken pool
+	# ------------------------------------------------------------------
+	def _disable_pool(self, pool, error):
+		if self.pool is pool:
+			self.print(f'‼️ Extraction pool failed ({type(error).__name__}: {error}), extracting in-thread')
+			self.workers = 0
+			self.pool    = None
+			pool.shutdown(wait=False, cancel_futures=True)
+
+	# Consume fetched pages from queue and extract their text,
+	# pass extracted pages on to `done` queue
+	# ------------------------------------------------------------------
+	async def _extract_worker(self, queue, done, timings):
+		while (doc := await queue.get()) is not None:
+			try:
+				if not doc.text:                          # Not known from page cache
+					with self.timed('extract', doc.name, timings):
+						doc.text = await self.extract(doc.html)
+					if self.cache and doc.text:
+						ww.services.PageCache.set_text(doc.name, doc.text)
+			except Exception as e:
+				doc.error = f'{type(e).__name__}: {e}'
+				self.print(f'‼️ Could not extract `{doc.name}`: {doc.error}')
+
+			await done.put(doc)
+
+	# Fetch all pages, then stop extraction workers and close `done`
+	# ------------------------------------------------------------------
+	async def _fetch_all(self, docs, semaphore, queue, done, workers, timings):
+		try:
+			await asyncio.gather(*[
+				self.fetch_page(doc, semaphore, queue, timings) for doc in docs
+			])
+			for _ in workers:
+				await queue.put(None)
+			await asyncio.gather(*workers)
+		finally:
+			done.put_nowait(None)
+
+	# ------------------------------------------------------------------
+	async def close(self):
+		if self.session is not None and not self.session.closed:
+			await self.session.close()
+		if self.pool is not None:
+			self.pool.shutdown(wait=False, cancel_futures=True)
+
+		self.session = None
+		self.pool    = None
+
+	# Fetch page through page cache: fresh entries are served as is,
+	# stale ones revalidated with conditional GET.
+	# Returns (html, extracted text or None when unknown).
+	# ------------------------------------------------------------------
+	async def fetch(self, url):
+		entry   = ww.services.PageCache.get(url) if self.cache else None
+		headers = {}
+
+		if entry is not None:
+			if entry['fresh']:
+				ww.services.PageCache.count('hit')
+				return entry['html'], entry['text']
+
+			if entry['etag']          : headers['If-None-Match']     = entry['etag']
+			if entry['last_modified'] : headers['If-Modified-Since'] = entry['last_modified']
+
+		async with self._get_session().get(url, headers=headers) as resp:
+			if resp.status == 304 and entry is not None:
+				ww.services.PageCache.touch(url)
+				ww.services.PageCache.count('revalidated')
+				return entry['html'], entry['text']
+
+			if resp.status >= 400:
+				resp.raise_for_status()
+			html = await resp.text(errors='ignore')
+
+			if self.cache:
+				ww.services.PageCache.set(
+					url,
+					html,
+					etag          = resp.headers.get('ETag'),
+					last_modified = resp.headers.get('Last-Modified')
+				)
+				ww.services.PageCache.count('miss')
+
+		return html, None
+
+	# ------------------------------------------------------------------
+	async def request(self, url):
+		html, _ = await self.fetch(url)
+		return html
+
+	# Time block under its own ww.Timer, add elapsed to stage total
+	# ------------------------------------------------------------------
+	@contextmanager
+	def timed(self, stage, key, timings=None):
+		name = f'{stage}:{key}'
+		ww.Timer.start(name)
+		try:
+			yield
+		finally:
+			elapsed = ww.Timer.stop(name).get_time()
+			if timings is not None:
+				timings[stage] = timings.get(stage, 0.0) + elapsed
 
 	# ------------------------------------------------------------------
 	def extract_text(self, html):
+		return _extract(html)
+
+	# Extract text in process pool, or in a thread when pool is disabled.
+	# Pool that breaks or cannot ship `_extract` to its workers (custom
+	# module loading, spawn start method) is dropped for in-thread work.
+	# ------------------------------------------------------------------
+	async def extract(self, html):
+		pool = self._get_pool()
 		text = None
 
-		if html:
-			text = trafilatura.extract(
-				html,
-				include_comments = False,
-				include_tables   = False
-			)
+		if pool is not None:
+			try:
+				text = await asyncio.get_running_loop().run_in_executor(pool, _extract, html)
+			except (BrokenExecutor, pickle.PicklingError, AttributeError, ImportError) as e:
+				self._disable_pool(pool, e)
+				pool = None
+
+		if pool is None:
+			text = await asyncio.to_thread(self.extract_text, html)
 
 		return text
 
+	# Fetch one page and queue it for extraction.
+	# Failure is recorded on page instead of raising.
 	# ------------------------------------------------------------------
-	async def load(self, docs):
-		result = []
+	async def fetch_page(self, doc, semaphore, queue, timings=None):
+		async with semaphore:
+			try:
+				with self.timed('fetch', doc.name, timings):
+					doc.html, text = await self.fetch(doc.name)
+				doc.text = text or doc.text
+			except Exception as e:
+				doc.error = f'{type(e).__name__}: {e}'
+				self.print(f'‼️ Could not load `{doc.name}`: {doc.error}')
+
+		if doc.error is None:
+			await queue.put(doc)                          # Blocks while queue is full
 
-		for doc in docs:
-			html = await self.request(doc.name)
-			text = self.extract_text(html)
+		return doc
 
-			doc.html = html
-			doc.text = text
+	# Yield pages as soon as their text is extracted (completion order).
+	# Concurrent fetch over shared session, extraction overlapped in
+	# worker processes. Pages failed to load are not yielded.
+	# Per-stage seconds are added to `timings` when given.
+	# ------------------------------------------------------------------
+	async def stream(self, docs, concurrency=None, timings=None):
+		semaphore = asyncio.Semaphore(concurrency or self.concurrency)
+		queue     = asyncio.Queue(maxsize=self.queue_size)
+		done      = asyncio.Queue()
+		workers   = [
+			asyncio.create_task(self._extract_worker(queue, done, timings))
+			for _ in range(max(self.workers, 1))
+		]
+		feeder    = asyncio.create_task(
+			self._fetch_all(docs, semaphore, queue, done, workers, timings)
+		)
 
-			result.append(doc)
+		try:
+			while (doc := await done.get()) is not None:
+				yield doc
+			await feeder
+		finally:
+			for task in [feeder, *workers]:
+				task.cancel()
+
+	# Load pages: concurrent fetch over shared session,
+	# extraction overlapped in worker processes
+	# ------------------------------------------------------------------
+	async def load(self, docs, concurrency=None):
+		docs = list(docs)
 
-		return result
+		async for _ in self.stream(docs, concurrency):
+			pass
 
+		return docs
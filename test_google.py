@@ -0,0 +1,52 @@
+import time
+import asyncio
+from aiohttp import web
+import ww, yo, o
+
+
+ww.Conf.PROJECT                 = 'test'
+ww.Conf.DB_PATH                 = f'{ww.Conf.PROJECT}.db'
+ww.Conf.GOOGLE_API_KEY          = 'stub'
+ww.Conf.GOOGLE_SEARCH_ENGINE_ID = 'stub'
+
+query    = f'sourdough starter feeding schedule {int(time.time())}'  # Fresh query, bypass DB cache
+requests = []
+
+async def search(request):
+	requests.append(request.query.get('q'))
+	await asyncio.sleep(0.2)                        # Keep request in flight
+
+	return web.json_response({'items': [
+		{'link': f'https://example.com/{i}', 'title': f'Result {i}', 'snippet': request.query.get('q')}
+		for i in range(3)
+	]})
+
+async def main():
+	app    = web.Application()
+	app.router.add_get('/customsearch/v1', search)
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site   = web.TCPSite(runner, '127.0.0.1', 0)
+	await site.start()
+
+	ww.services.Google.url = f'http://127.0.0.1:{runner.addresses[0][1]}/customsearch/v1'
+
+	try:
+		return await asyncio.gather(*[
+			ww.services.Google.search(query, top_k=3) for _ in range(5)
+		])
+	finally:
+		await ww.services.Google.close()
+		await runner.cleanup()
+
+
+results = asyncio.run(main())
+
+print()
+print('=' * 80)
+print('QUERY:', query)
+print('Requests to stub:', len(requests))
+print('=' * 80)
+
+for pages in results:
+	print([page.name for page in pages])
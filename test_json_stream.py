@@ -0,0 +1,22 @@
+import ww
+
+
+output = (
+	'Sure, here is the JSON:\n'
+	'{"answer": 15, "steps": [3, 5, 7], "note": "sum of \\"3, 5, 7\\" }"}'
+	'\nLet me know if you need anything else!'
+)
+
+parser = ww.parsers.JsonStream()
+
+for i in range(0, len(output), 4):
+	for key, value in parser.feed(output[i:i+4]):
+		print('Field:', key, '=', value)
+
+	if parser.done:
+		print('Root closed after', i + 4, 'of', len(output), 'chars')
+		break
+
+print()
+print('=' * 80)
+print(parser.load())
@@ -0,0 +1,101 @@
+import json
+import asyncio
+from aiohttp import web
+import ww, yo, o
+
+
+ww.Conf.PROJECT = 'test'
+ww.Conf.DB_PATH = f'{ww.Conf.PROJECT}.db'
+
+ww.llms.OpenaiModel.backoff = 0.01
+
+answer   = {'city': 'Paris', 'country': 'France'}
+requests = []
+
+
+class Capital(o.Schema):
+	city    = o.F(str, 'Capital city')
+	country = o.F(str, 'Country')
+
+
+# Stub: every first request of a pair is rate limited, second answers
+# ----------------------------------------------------------------------
+async def completions(request):
+	body = await request.json()
+	requests.append(body.get('stream', False))
+
+	if len(requests) % 2:
+		return web.json_response({'error': {'message': 'slow down'}}, status=429, headers={'Retry-After': '0'})
+
+	content = json.dumps(answer)
+
+	if not body.get('stream'):
+		return web.json_response({
+			'id'      : 'stub',
+			'object'  : 'chat.completion',
+			'created' : 0,
+			'model'   : body['model'],
+			'choices' : [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+		})
+
+	response = web.StreamResponse(headers={'Content-Type': 'text/event-stream'})
+	await response.prepare(request)
+
+	for i in range(0, len(content), 5):
+		chunk = {
+			'id'      : 'stub',
+			'object'  : 'chat.completion.chunk',
+			'created' : 0,
+			'model'   : body['model'],
+			'choices' : [{'index': 0, 'delta': {'content': content[i:i + 5]}, 'finish_reason': None}],
+		}
+		await response.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+
+	await response.write(b'data: [DONE]\n\n')
+	await response.write_eof()
+	return response
+
+
+async def start():
+	app    = web.Application()
+	app.router.add_post('/v1/chat/completions', completions)
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site   = web.TCPSite(runner, '127.0.0.1', 0)
+	await site.start()
+	return runner
+
+
+async def main(model, stream):
+	runner         = await start()
+	model.base_url = f'http://127.0.0.1:{runner.addresses[0][1]}/v1'
+	model.stream   = stream
+	fields         = []
+
+	try:
+		result = await model.generate(
+			prompt   = 'What is the capital of France?',
+			schema   = Capital,
+			verbose  = False,
+			on_field = lambda key, value: fields.append(key),
+			cache    = False
+		)
+	finally:
+		await model.close()
+		await runner.cleanup()
+
+	return result, fields
+
+
+model = ww.llms.OpenaiModel('stub-model', api_key='stub')
+
+# Same model instance across separate event loops
+for stream in (False, True):
+	result, fields = asyncio.run(main(model, stream))
+
+	print()
+	print('=' * 80)
+	print('STREAM:', stream, 'RESULT:', result, 'FIELDS:', fields)
+	print('=' * 80)
+
+print('Requests to stub (stream flag):', requests)
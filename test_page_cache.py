@@ -0,0 +1,59 @@
+import asyncio
+from aiohttp import web
+import ww, yo, o
+
+
+ww.Conf.PROJECT = 'test'
+ww.Conf.DB_PATH = f'{ww.Conf.PROJECT}.db'
+
+ww.services.PageCache.fresh_for = 0               # Revalidate on every request
+
+html     = '<html><body><article><h1>Sourdough</h1><p>' + 'Feed the starter, mix, fold and let it rise. ' * 20 + '</p></article></body></html>'
+etag     = '"sourdough-v1"'
+requests = []
+statuses = []
+
+async def page(request):
+	requests.append(request.headers.get('If-None-Match'))
+
+	if request.headers.get('If-None-Match') == etag:
+		statuses.append(304)
+		return web.Response(status=304, headers={'ETag': etag})
+
+	statuses.append(200)
+	return web.Response(text=html, content_type='text/html', headers={'ETag': etag})
+
+async def main():
+	app    = web.Application()
+	app.router.add_get('/page', page)
+	runner = web.AppRunner(app)
+	await runner.setup()
+	site   = web.TCPSite(runner, '127.0.0.1', 0)
+	await site.start()
+
+	port = runner.addresses[0][1]
+	url  = f'http://127.0.0.1:{port}/page'
+
+	ww.services.PageCache.clear()
+
+	try:
+		for _ in range(2):
+			docs = await ww.services.WebSite.load([o.T.WebPage(name=url, source='test')])
+			print(docs[0])
+	finally:
+		await ww.services.WebSite.close()
+		await runner.cleanup()
+
+
+asyncio.run(main())
+
+print()
+print('=' * 80)
+print('Conditional headers sent:', requests)
+print('Responses:', statuses)
+print('Cache:', ww.services.PageCache.stats())
+print('=' * 80)
+
+# Second load must revalidate, not be served as a plain hit
+assert requests == [None, etag], requests
+assert statuses == [200, 304], statuses
@@ -0,0 +1,44 @@
+import time
+import ww, yo, o
+
+
+ww.Conf.PROJECT = 'test'
+ww.Conf.DB_PATH = f'{ww.Conf.PROJECT}.db'
+
+rag    = ww.services.Rag
+key    = f'growing_{int(time.time())}'                # Fresh domain per run
+query  = 'how long does the dough rise'
+
+first  = 'Mix flour and water. Add the starter. Knead for ten minutes.'
+grown  = first + ' Let the dough rise for two hours. Shape the loaf. Bake it hot.'
+other  = 'Tomatoes need full sun. Water them every morning. Pick them when red.'
+
+texts  = {
+	'bread.txt'  : yo.parsers.Pysbd(grown),
+	'garden.txt' : yo.parsers.Pysbd(other),
+}
+
+# Grow `bread.txt` after `garden.txt` took the ids right behind it
+domain = rag.add_domain(key).id
+rag.add_document(domain, 'bread.txt',  first, mtime=1)
+rag.add_document(domain, 'garden.txt', other, mtime=1)
+rag.update_document(domain, 'bread.txt', grown, mtime=2)
+
+result = rag.search(domain, query, top_k=20)
+
+print()
+print('=' * 80)
+print('QUERY:', query)
+print('=' * 80)
+
+for document, items in result.items():
+	print('Document:', document)
+	print('-' * 80)
+	yo.viz.ScoredText(items)
+	print()
+
+	# Every hit must be a sentence of the document it is reported under
+	for _, _, text in items:
+		assert text in texts[document], f'`{text}` reported under `{document}`'
+
+rag.remove_domain(domain)
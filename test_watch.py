@@ -0,0 +1,48 @@
+import os
+import asyncio
+import tempfile
+import ww, yo, o
+
+
+ww.Conf.PROJECT   = 'test'
+ww.Conf.DB_PATH   = f'{ww.Conf.PROJECT}.db'
+ww.Conf.EXPERTISE = ww.expertise
+
+ww.services.Expertise.poll_interval = 0.2
+ww.services.Expertise.debounce      = 0.2
+
+root   = tempfile.mkdtemp()
+domain = 'watched'
+query  = 'how long does the dough rise'
+
+os.makedirs(os.path.join(root, domain))
+
+async def main():
+	stop    = asyncio.Event()
+	watcher = asyncio.create_task(ww.services.Expertise.watch(root, stop))
+
+	await asyncio.sleep(0.5)
+
+	with open(os.path.join(root, domain, 'dough.txt'), 'w') as f:
+		f.write('Let the dough rise for two hours in a warm place. Then shape the loaf.')
+
+	await asyncio.sleep(3)
+
+	stop.set()
+	await watcher
+
+	return ww.services.Expertise.search(domain, query, top_k=3)
+
+
+result = asyncio.run(main())
+
+print()
+print('=' * 80)
+print('QUERY:', query)
+print('=' * 80)
+
+for document, items in result.items():
+	print('Document:', document)
+	print('-' * 80)
+	yo.viz.ScoredText(items)
+	print()